@@ -5,10 +5,14 @@ This example shows how to split long documents into manageable chunks
 while preserving paragraph structure.
 """
 
-from ai_utils import split_into_chunks, estimate_token_count
+from ai_utils import split_into_chunks, estimate_token_count, estimate_token_counts_batch
 
 MODEL = "gpt-3.5-turbo"
 
+# Generated demo inputs are built once at import instead of on every main() run.
+LONG_PARAGRAPH = " ".join(f"word{i}" for i in range(1, 101))
+SAMPLE_DOC = "Lorem ipsum " * 200  # 400 words
+
 
 def main():
     print("=" * 60)
@@ -25,8 +29,9 @@ def main():
     print(f"Original text ({estimate_token_count(simple_text, model=MODEL)} tokens):")
     print(simple_text)
     print(f"\nSplit into {len(chunks)} chunks (max 3 tokens each):")
-    for i, chunk in enumerate(chunks, 1):
-        print(f"  Chunk {i} ({estimate_token_count(chunk, model=MODEL)} tokens): {chunk}")
+    token_counts = estimate_token_counts_batch(chunks, model=MODEL)
+    for i, (chunk, tokens) in enumerate(zip(chunks, token_counts), 1):
+        print(f"  Chunk {i} ({tokens} tokens): {chunk}")
 
     # Example 2: Paragraph-aware chunking
     print("\n2. PARAGRAPH-AWARE CHUNKING")
@@ -45,8 +50,8 @@ def main():
     chunks = split_into_chunks(document.strip(), max_tokens=50, overlap_tokens=10)
 
     print(f"Document with {len(chunks)} chunks:")
-    for i, chunk in enumerate(chunks, 1):
-        tokens = estimate_token_count(chunk, model=MODEL)
+    token_counts = estimate_token_counts_batch(chunks, model=MODEL)
+    for i, (chunk, tokens) in enumerate(zip(chunks, token_counts), 1):
         preview = chunk[:60] + "..." if len(chunk) > 60 else chunk
         print(f"\nChunk {i} ({tokens} tokens):")
         print(f"  {preview}")
@@ -77,32 +82,30 @@ def main():
     chunks = split_into_chunks(transcript.strip(), max_tokens=100, overlap_tokens=20)
 
     print(f"Transcript split into {len(chunks)} chunks for LLM processing:\n")
-    for i, chunk in enumerate(chunks, 1):
-        tokens = estimate_token_count(chunk, model=MODEL)
+    token_counts = estimate_token_counts_batch(chunks, model=MODEL)
+    for i, (chunk, tokens) in enumerate(zip(chunks, token_counts), 1):
         lines = chunk.count('\n') + 1
+        first_line = chunk.partition('\n')[0]
         print(f"Chunk {i}: {tokens} tokens, {lines} lines")
-        print(f"First line: {chunk.split(chr(10))[0][:50]}...")
+        print(f"First line: {first_line[:50]}...")
         print()
 
     # Example 4: Handling very long paragraphs
     print("\n4. HANDLING LONG PARAGRAPHS")
     print("-" * 60)
 
-    long_paragraph = " ".join([f"word{i}" for i in range(1, 101)])
-    chunks = split_into_chunks(long_paragraph, max_tokens=20)
+    chunks = split_into_chunks(LONG_PARAGRAPH, max_tokens=20)
 
     print(f"Long paragraph (100 words) split into {len(chunks)} chunks of max 20 tokens:")
-    for i, chunk in enumerate(chunks, 1):
-        tokens = estimate_token_count(chunk, model=MODEL)
-        word_range = chunk.split()[0] + " ... " + chunk.split()[-1]
+    token_counts = estimate_token_counts_batch(chunks, model=MODEL)
+    for i, (chunk, tokens) in enumerate(zip(chunks, token_counts), 1):
+        word_range = chunk.partition(" ")[0] + " ... " + chunk.rpartition(" ")[2]
         print(f"  Chunk {i}: {tokens} tokens ({word_range})")
 
     # Example 5: Optimal chunk size for different LLMs
     print("\n5. OPTIMAL CHUNK SIZES FOR DIFFERENT USE CASES")
     print("-" * 60)
 
-    sample_doc = "Lorem ipsum " * 200  # 400 words
-
     use_cases = [
         ("GPT-3.5 with room for response", 2000),
         ("GPT-4 with room for response", 4000),
@@ -111,7 +114,7 @@ def main():
     ]
 
     for use_case, max_tokens in use_cases:
-        chunks = split_into_chunks(sample_doc, max_tokens=max_tokens, overlap_tokens=100)
+        chunks = split_into_chunks(SAMPLE_DOC, max_tokens=max_tokens, overlap_tokens=100)
         print(f"{use_case:35s}: {len(chunks):2d} chunks of ~{max_tokens} tokens")
 
 
@@ -9,9 +9,13 @@ Run: pip install ai-utils[llm]
 """
 
 import os
-from ai_utils import LLMClient, split_into_chunks, estimate_token_count
+from concurrent.futures import ThreadPoolExecutor
+
+from ai_utils import LLMClient, split_into_chunks, estimate_token_count, safe_extract_json
 
 TOKEN_MODEL = "gpt-3.5-turbo"
+MAX_CONCURRENT_REQUESTS = 8
+CHUNKS_PER_PROMPT = 5
 
 
 def example_basic_usage():
@@ -76,18 +80,24 @@ def example_processing_chunks():
     try:
         client = LLMClient()
 
-        summaries = []
-        for i, chunk in enumerate(chunks, 1):
-            token_count = estimate_token_count(chunk, model=TOKEN_MODEL)
-            print(f"Processing chunk {i}/{len(chunks)} ({token_count} tokens)...")
-
+        def summarize(indexed_chunk):
+            i, chunk = indexed_chunk
             # In real usage, this would make actual API calls
-            # summary = client.generate(f"Summarize: {chunk}", max_tokens=30)
-            # summaries.append(summary)
+            # return client.generate(f"Summarize: {chunk}", max_tokens=30)
 
             # For demo without API key:
+            return f"[Summary of chunk {i}]"
+
+        for i, chunk in enumerate(chunks, 1):
+            token_count = estimate_token_count(chunk, model=TOKEN_MODEL)
+            print(f"Processing chunk {i}/{len(chunks)} ({token_count} tokens)...")
             print(f"  Would send: {chunk[:50]}...")
-            summaries.append(f"[Summary of chunk {i}]")
+
+        # LLM calls are network-bound, so issue them concurrently instead of
+        # waiting on each round-trip in turn. Keep max_workers within your
+        # provider's rate limits; map() preserves the chunk order.
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(chunks) or 1)) as pool:
+            summaries = list(pool.map(summarize, enumerate(chunks, 1)))
 
         print("\nAll chunks processed!")
         print("Summaries:", summaries)
@@ -97,6 +107,53 @@ def example_processing_chunks():
         print(f"Simulating output without actual API calls.")
 
 
+def build_batched_prompt(batch):
+    """Pack several chunks into one prompt that asks for a JSON list back."""
+    numbered = "\n---\n".join(f"[{i}] {chunk}" for i, chunk in enumerate(batch))
+    return (
+        f"Summarize each of the {len(batch)} numbered inputs below in one sentence. "
+        "Return only a JSON list of strings, one summary per input, in order.\n\n"
+        f"{numbered}"
+    )
+
+
+def example_batched_prompts(batch_size=CHUNKS_PER_PROMPT):
+    """Send several chunks per request instead of one request per chunk."""
+    print("\n" + "=" * 60)
+    print("BATCHING CHUNKS INTO FEWER PROMPTS")
+    print("=" * 60)
+
+    document = " ".join(
+        f"Section {i} describes part {i} of the quarterly operations review." for i in range(1, 13)
+    )
+    chunks = split_into_chunks(document, max_tokens=20)
+
+    # Each request carries the instructions once for the whole batch, so the
+    # number of API calls drops by batch_size. Larger batches give diminishing
+    # returns and make a single bad response cost more, so tune batch_size
+    # against your provider's rate limits and context window.
+    batches = [chunks[i : i + batch_size] for i in range(0, len(chunks), batch_size)]
+    print(f"{len(chunks)} chunks -> {len(batches)} requests (batch_size={batch_size})\n")
+
+    summaries = []
+    for n, batch in enumerate(batches, 1):
+        prompt = build_batched_prompt(batch)
+        print(f"Request {n}: {len(batch)} chunks, {estimate_token_count(prompt, model=TOKEN_MODEL)} tokens")
+
+        # In real usage:
+        # response = client.generate(prompt, max_tokens=30 * len(batch))
+        # For demo without API key:
+        response = "Here you go: [" + ", ".join(f'"Summary of chunk {i}"' for i in range(len(batch))) + "]"
+
+        parsed = safe_extract_json(response, default=[])
+        if not isinstance(parsed, list) or len(parsed) != len(batch):
+            # The model broke the format; in real usage, resend these chunks one by one.
+            parsed = [f"[Unparsed summary {i}]" for i in range(len(batch))]
+        summaries.extend(parsed)
+
+    print(f"\nCollected {len(summaries)} summaries")
+
+
 def example_error_handling():
     """Demonstrate error handling and retries."""
     print("\n" + "=" * 60)
@@ -171,6 +228,7 @@ def main():
     print("\n" + "🤖 " * 20 + "\n")
     example_basic_usage()
     example_processing_chunks()
+    example_batched_prompts()
     example_error_handling()
     example_multiple_providers()
     print("\n" + "🤖 " * 20 + "\n")
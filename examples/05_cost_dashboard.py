@@ -13,82 +13,175 @@ from __future__ import annotations
 import argparse
 import csv
 import datetime as dt
+import io
+import itertools
 import json
+import math
+import multiprocessing
+import re
+import sys
 from collections import defaultdict
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, Iterator, Optional
 
-from ai_utils import estimate_llm_cost
+from ai_utils import estimate_token_counts_batch, get_model_pricing
 
-Record = dict[str, str]
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
 
 
-def load_records(csv_path: Path | None) -> list[Record]:
+def _dumps_indented(payload: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(payload, indent=2)
+
+# (date, model, prompt, expected_response_tokens) -- plain tuples are much
+# cheaper to build per row than the dicts produced by csv.DictReader.
+Record = tuple[str, str, str, Optional[str]]
+
+_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+_REQUIRED_COLUMNS = ("date", "model", "prompt")
+
+
+def load_records(csv_path: Path | None) -> Iterator[Record]:
     if csv_path is None or not csv_path.exists():
-        return _generate_synthetic_records()
+        yield from _generate_synthetic_records()
+        return
 
-    records: list[Record] = []
     with csv_path.open(newline="", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh)
+        reader = csv.reader(fh)
+        header = next(reader, [])
+        missing = [name for name in _REQUIRED_COLUMNS if name not in header]
+        if missing:
+            raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+
+        date_idx, model_idx, prompt_idx = (header.index(name) for name in _REQUIRED_COLUMNS)
+        expected_idx = (
+            header.index("expected_response_tokens") if "expected_response_tokens" in header else None
+        )
+        min_len = max(date_idx, model_idx, prompt_idx) + 1
+
         for row in reader:
-            if not row.get("prompt") or not row.get("model"):
+            if len(row) < min_len or not row[prompt_idx] or not row[model_idx]:
                 continue
-            records.append(row)
-    return records
+            expected = row[expected_idx] if expected_idx is not None and expected_idx < len(row) else None
+            yield row[date_idx], row[model_idx], row[prompt_idx], expected
 
 
-def _generate_synthetic_records() -> list[Record]:
+def _generate_synthetic_records() -> Iterator[Record]:
     today = dt.date.today()
-    records: list[Record] = []
     models = ["gpt-4o", "gpt-3.5-turbo", "claude-3-sonnet"]
     for month_offset in range(3):
         base_date = today - dt.timedelta(days=30 * month_offset)
+        date = base_date.strftime("%Y-%m-%d")
         for model in models:
             for i in range(50):
                 prompt = f"Synthetic prompt #{i} for {model} in {base_date:%Y-%m}"
-                records.append(
-                    {
-                        "date": base_date.strftime("%Y-%m-%d"),
-                        "model": model,
-                        "prompt": prompt,
-                        "expected_response_tokens": "150",
-                    }
-                )
-    return records
-
-
-def aggregate_costs(records: Iterable[Record]) -> tuple[dict[str, float], dict[str, float], float]:
-    per_model: defaultdict[str, float] = defaultdict(float)
-    per_month: defaultdict[str, float] = defaultdict(float)
+                yield date, model, prompt, "150"
+
+
+def _make_cost_fn(model: str, expected: str | None) -> Callable[[int], float]:
+    """Return ``prompt_tokens -> USD`` with pricing and completion size pre-bound.
+
+    Each result equals ``estimate_llm_cost`` for the same prompt, including
+    its rounding and its rejection of negative completion sizes.
+    """
+    input_price, output_price = get_model_pricing(model)
+    per_input_token = input_price / 1000
+    per_output_token = output_price / 1000
+
+    if expected:
+        completion_tokens = int(expected)
+        if completion_tokens < 0:
+            raise ValueError("expected_response_tokens must be a non-negative integer or None")
+        # Fixed completion size (e.g. the synthetic 150-token records): the
+        # completion cost folds into a constant.
+        completion_cost = completion_tokens * per_output_token
+        return lambda prompt_tokens: round(prompt_tokens * per_input_token + completion_cost, 8)
+
+    return lambda prompt_tokens: round(
+        prompt_tokens * per_input_token + math.ceil(prompt_tokens * 0.25) * per_output_token, 8
+    )
 
-    for record in records:
-        prompt = record["prompt"]
-        model = record["model"]
-        expected = record.get("expected_response_tokens")
-        expected_tokens = int(expected) if expected else None
-        cost = estimate_llm_cost(prompt, model=model, expected_response_tokens=expected_tokens)
-        per_model[model] += cost
 
-        date = dt.datetime.strptime(record["date"], "%Y-%m-%d").date()
-        month_key = date.strftime("%Y-%m")
-        per_month[month_key] += cost
+def _aggregate_groups(records: Iterable[Record]) -> dict[tuple[str, str], float]:
+    # Bucket the shard by (model, expected_response_tokens) so each bucket's
+    # prompts are counted with one estimate_token_counts_batch call and
+    # priced by one specialised cost function; real and synthetic data repeat
+    # these pairs heavily.
+    buckets: defaultdict[tuple[str, str | None], tuple[list[str], list[str]]] = defaultdict(
+        lambda: ([], [])
+    )
+    for date, model, prompt, expected in records:
+        if not _DATE_PATTERN.fullmatch(date):
+            raise ValueError(f"Invalid date {date!r}; expected YYYY-MM-DD")
+        prompts, months = buckets[(model, expected)]
+        prompts.append(prompt)
+        months.append(date[:7])
+
+    # Accumulate once per (model, month) group; the number of groups is tiny
+    # compared to the number of records.
+    per_group: defaultdict[tuple[str, str], float] = defaultdict(float)
+    for (model, expected), (prompts, months) in buckets.items():
+        cost_fn = _make_cost_fn(model, expected)
+        token_counts = estimate_token_counts_batch(prompts, model=model)
+        for month, prompt_tokens in zip(months, token_counts):
+            per_group[(model, month)] += cost_fn(prompt_tokens)
+
+    return dict(per_group)
+
+
+def _iter_shards(records: Iterable[Record], size: int) -> Iterator[list[Record]]:
+    iterator = iter(records)
+    while True:
+        shard = list(itertools.islice(iterator, size))
+        if not shard:
+            return
+        yield shard
+
+
+def aggregate_costs(
+    records: Iterable[Record],
+    workers: int = 1,
+    shard_size: int = 10_000,
+) -> tuple[dict[str, float], dict[str, float], float]:
+    per_group: defaultdict[tuple[str, str], float] = defaultdict(float)
+    # Shards bound how many prompts _aggregate_groups buffers at once.
+    shards = _iter_shards(records, shard_size)
+
+    if workers > 1:
+        # Costing is CPU-bound and independent per row, so shards of the
+        # stream are aggregated in worker processes and merged here.
+        with multiprocessing.Pool(processes=workers) as pool:
+            partials = pool.imap_unordered(_aggregate_groups, shards)
+            for partial in partials:
+                for key, total in partial.items():
+                    per_group[key] += total
+    else:
+        for shard in shards:
+            for key, total in _aggregate_groups(shard).items():
+                per_group[key] += total
+
+    per_model: defaultdict[str, float] = defaultdict(float)
+    per_month: defaultdict[str, float] = defaultdict(float)
+    for (model, month), total in per_group.items():
+        per_model[model] += total
+        per_month[month] += total
 
     grand_total = sum(per_model.values())
     return dict(per_model), dict(per_month), grand_total
 
 
 def print_text_summary(per_model: dict[str, float], per_month: dict[str, float], grand_total: float) -> None:
-    print("Cost dashboard summary")
-    print("======================")
-    print("Per-model spend:")
-    for model, total in sorted(per_model.items()):
-        print(f"  {model:20s} ${total:,.2f}")
-
-    print("\nPer-month spend:")
-    for month, total in sorted(per_month.items()):
-        print(f"  {month} ${total:,.2f}")
-
-    print(f"\nGrand total (all records): ${grand_total:,.2f}")
+    lines = ["Cost dashboard summary", "======================", "Per-model spend:"]
+    lines.extend(f"  {model:20s} ${total:,.2f}" for model, total in sorted(per_model.items()))
+    lines.append("\nPer-month spend:")
+    lines.extend(f"  {month} ${total:,.2f}" for month, total in sorted(per_month.items()))
+    lines.append(f"\nGrand total (all records): ${grand_total:,.2f}")
+    # One write instead of a print() per line.
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def emit_structured_summary(
@@ -108,16 +201,16 @@ def emit_structured_summary(
             "per_month": per_month,
             "grand_total": grand_total,
         }
-        text = json.dumps(payload, indent=2)
+        text = _dumps_indented(payload)
     elif fmt == "csv":
         rows = [("per_model", label, total) for label, total in per_model.items()]
         rows += [("per_month", label, total) for label, total in per_month.items()]
         rows.append(("grand_total", "all", grand_total))
-        output = []
-        output.append("category,label,total_usd")
-        for category, label, total in rows:
-            output.append(f"{category},{label},{total:.4f}")
-        text = "\n".join(output)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(("category", "label", "total_usd"))
+        writer.writerows((category, label, f"{total:.4f}") for category, label, total in rows)
+        text = buffer.getvalue().rstrip("\n")
     else:
         raise ValueError(f"Unsupported format: {fmt}")
 
@@ -140,11 +233,17 @@ def main() -> None:
         "--output-path",
         help="Optional file path for structured summaries (defaults to stdout)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for aggregating large CSVs (default: 1, no multiprocessing)",
+    )
     args = parser.parse_args()
 
     csv_path = Path(args.csv).expanduser() if args.csv else None
     records = load_records(csv_path)
-    per_model, per_month, grand_total = aggregate_costs(records)
+    per_model, per_month, grand_total = aggregate_costs(records, workers=args.workers)
     output_path = Path(args.output_path).expanduser() if args.output_path else None
     emit_structured_summary(per_model, per_month, grand_total, args.output_format, output_path)
 
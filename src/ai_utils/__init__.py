@@ -5,22 +5,28 @@ ai-utils: A small Python package with helpful AI utility functions.
 __version__ = "0.1.0"
 
 import json
-import math
 import os
 import re
+from functools import lru_cache
 from importlib import resources
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
 
-# Import LLMClient if requests is available
-try:
+# Import additional helpers
+from .helpers import safe_extract_json, safe_extract_json_batch, configure_logging, retry_with_backoff
+
+if TYPE_CHECKING:
+    # Type checkers see LLMClient directly; at runtime __getattr__ imports it.
     from .llm_client import LLMClient
-    _has_llm_client = True
+
+# Optional exact tokenizer for OpenAI models
+try:
+    import tiktoken  # type: ignore[import-not-found]
 except ImportError:
-    _has_llm_client = False
-    LLMClient = None  # type: ignore
+    tiktoken = None
 
-# Import additional helpers
-from .helpers import safe_extract_json, configure_logging, retry_with_backoff
+# Exact counts change results relative to the heuristic, so they are opt-in.
+_EXACT_TOKENS_ENABLED = os.environ.get("AI_UTILS_EXACT_TOKENS", "").strip().lower() in {"1", "true", "yes"}
 
 _DEFAULT_MODEL = "gpt-3.5-turbo"
 _DEFAULT_CHARS_PER_TOKEN = 4.0
@@ -75,36 +81,81 @@ def _load_pricing_config() -> dict[str, dict[str, float]]:
     return {}
 
 
-_CONFIG_PRICING = _load_pricing_config()
-
 _SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?。！？])\s+|[\r\n]+", re.UNICODE)
-
-
-def _normalized_model_name(model: str) -> str:
+# Every split point involves one of these characters; text containing none of
+# them can skip the regex scan entirely.
+_SENTENCE_BOUNDARY_CHARS = ".!?。！？\r\n"
+_SUMMARY_SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+(?=[A-Z])")
+# ASCII characters other than " " for which str.isspace() is true.
+_ASCII_NON_SPACE_WHITESPACE = "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f"
+_SUMMARY_ELLIPSIS = " ... "
+_SUMMARY_ELLIPSIS_LEN = len(_SUMMARY_ELLIPSIS)
+
+# The text-keyed memo caches only hold inputs up to this length, so their
+# worst-case footprint is bounded by maxsize * this many characters; longer
+# documents are processed directly (and rarely repeat verbatim anyway).
+_TEXT_CACHE_MAX_CHARS = 4096
+
+
+@lru_cache(maxsize=64)
+def _normalize_model(model: str) -> tuple[str, str]:
+    """Return ``(stripped, lower-cased)`` forms of a model name."""
     normalized = model.strip()
     if not normalized:
         raise ValueError("model must be a non-empty string")
-    return normalized
+    return normalized, normalized.lower()
+
+
+# Longest prefix first so matching does not depend on dict order
+# ("gpt-4.1" must be tried before "gpt-4").
+_CHARS_PER_TOKEN_PREFIXES: tuple[tuple[str, float], ...] = tuple(
+    sorted(_MODEL_CHAR_PER_TOKEN.items(), key=lambda item: len(item[0]), reverse=True)
+)
 
 
+@lru_cache(maxsize=32)
 def _chars_per_token_for_model(model: str) -> float:
     normalized = model.lower()
-    for prefix, ratio in _MODEL_CHAR_PER_TOKEN.items():
+    for prefix, ratio in _CHARS_PER_TOKEN_PREFIXES:
         if normalized.startswith(prefix):
             return max(_MIN_CHARS_PER_TOKEN, ratio)
     return _DEFAULT_CHARS_PER_TOKEN
 
 
+@lru_cache(maxsize=32)
+def _chars_per_token_x10_for_model(model: str) -> int:
+    # Ratios have one decimal place, so tenths let the token estimate use
+    # exact integer ceiling division instead of float division + math.ceil.
+    return round(_chars_per_token_for_model(model) * 10)
+
+
+def _pricing_items_longest_first(table: dict[str, dict[str, float]]) -> list[tuple[str, dict[str, float]]]:
+    # Longest prefix wins, so "gpt-4o-mini" is not shadowed by "gpt-4o".
+    items = [(prefix.lower(), pricing) for prefix, pricing in table.items()]
+    items.sort(key=lambda item: len(item[0]), reverse=True)
+    return items
+
+
+@lru_cache(maxsize=None)
+def _base_pricing() -> dict[str, dict[str, float]]:
+    # Loaded on first use so importing the package does no file I/O.
+    return {**_MODEL_PRICING_USD, **_load_pricing_config()}
+
+
+@lru_cache(maxsize=None)
+def _base_pricing_items() -> list[tuple[str, dict[str, float]]]:
+    return _pricing_items_longest_first(_base_pricing())
+
+
 def _pricing_for_model(model: str, pricing_overrides: dict[str, dict[str, float]] | None = None) -> dict[str, float]:
-    lookup: dict[str, dict[str, float]] = {}
-    lookup.update(_MODEL_PRICING_USD)
-    lookup.update(_CONFIG_PRICING)
     if pricing_overrides:
-        lookup.update(pricing_overrides)
+        items = _pricing_items_longest_first({**_base_pricing(), **pricing_overrides})
+    else:
+        items = _base_pricing_items()
 
     normalized = model.lower()
-    for prefix, pricing in lookup.items():
-        if normalized.startswith(prefix.lower()):
+    for prefix, pricing in items:
+        if normalized.startswith(prefix):
             return {
                 "input": max(0.0, pricing.get("input", 0.0)),
                 "output": max(0.0, pricing.get("output", pricing.get("input", 0.0))),
@@ -112,26 +163,57 @@ def _pricing_for_model(model: str, pricing_overrides: dict[str, dict[str, float]
     raise ValueError(f"No pricing data available for model '{model}'")
 
 
-def _split_sentences(text: str) -> list[str]:
+@lru_cache(maxsize=32)
+def _exact_encoding_for_model(model: str):
+    """Return a tiktoken encoding for ``model`` when exact counting is enabled, else None."""
+    if tiktoken is None or not _EXACT_TOKENS_ENABLED:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception:
+        # Unknown model, or the encoding files could not be loaded
+        return None
+
+
+def _iter_sentences(text: str) -> Iterator[str]:
+    """Yield stripped, non-empty sentences lazily so callers can stop early."""
     stripped = text.strip()
     if not stripped:
-        return []
-    sentences = [segment.strip() for segment in _SENTENCE_SPLIT_PATTERN.split(stripped) if segment.strip()]
-    return sentences or [stripped]
+        return
+    if not any(char in stripped for char in _SENTENCE_BOUNDARY_CHARS):
+        yield stripped
+        return
+    start = 0
+    for match in _SENTENCE_SPLIT_PATTERN.finditer(stripped):
+        sentence = stripped[start : match.start()].strip()
+        if sentence:
+            yield sentence
+        start = match.end()
+    sentence = stripped[start:].strip()
+    if sentence:
+        yield sentence
 
 
 def _truncate_segment(segment: str, token_limit: int, model: str) -> str:
-    if token_limit <= 0 or not segment.strip():
-        return ""
-    words = segment.split()
     stripped = segment.strip()
-    if words and len(words) > token_limit:
-        return " ".join(words[:token_limit])
+    if token_limit <= 0 or not stripped:
+        return ""
+    # Bounded split: stop after token_limit words instead of splitting the
+    # whole segment. When there are more words, the last part is the rest,
+    # so the kept words are the original text in front of it (spacing intact).
+    words = stripped.split(None, token_limit)
+    if len(words) > token_limit:
+        kept = stripped[: len(stripped) - len(words[-1])].rstrip()
+        if _estimate_tokens(kept, model) <= token_limit:
+            return kept
+        # Kept whitespace runs count against the character-based estimate, so
+        # collapse them and keep the longest word prefix that fits.
+        return _fit_word_prefix(words[:token_limit], token_limit, model)
     if words:
         if len(words) == 1 and words[0] == stripped:
             approx_chars = max(1, int(token_limit * _chars_per_token_for_model(model)))
             return stripped[:approx_chars]
-        if estimate_token_count(stripped, model=model) <= token_limit:
+        if _estimate_tokens(stripped, model) <= token_limit:
             return stripped
         approx_chars = max(1, int(token_limit * _chars_per_token_for_model(model)))
         return stripped[:approx_chars]
@@ -140,59 +222,121 @@ def _truncate_segment(segment: str, token_limit: int, model: str) -> str:
     return stripped[:approx_chars]
 
 
-def _split_segment_into_chunks(segment: str, max_tokens: int, model: str) -> list[str]:
-    """Split a single sentence/segment into smaller chunks that fit max_tokens."""
+def _fit_word_prefix(words: list[str], token_limit: int, model: str) -> str:
+    """Join the most leading ``words`` whose estimate fits ``token_limit``."""
+    # Estimates grow with every added word, so binary-search the cut.
+    low, high = 0, len(words)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if _estimate_tokens(" ".join(words[:middle]), model) <= token_limit:
+            low = middle
+        else:
+            high = middle - 1
+    if low:
+        return " ".join(words[:low])
+    approx_chars = max(1, int(token_limit * _chars_per_token_for_model(model)))
+    return words[0][:approx_chars]
+
+
+def _iter_segment_chunks(segment: str, max_tokens: int, model: str) -> Iterator[tuple[str, int]]:
+    """Yield ``(chunk, tokens)`` pieces of a single sentence/segment that fit max_tokens."""
     stripped = segment.strip()
     if not stripped:
-        return []
+        return
 
     words = stripped.split()
     if not words or (len(words) == 1 and words[0] == stripped):
         approx_chars = max(1, int(max_tokens * _chars_per_token_for_model(model)))
-        return [stripped[i : i + approx_chars] for i in range(0, len(stripped), approx_chars)]
+        for i in range(0, len(stripped), approx_chars):
+            piece = stripped[i : i + approx_chars]
+            yield piece, _estimate_tokens(piece, model)
+        return
+
+    encoding = _exact_encoding_for_model(model)
+    if encoding is not None:
+        yield from _iter_segment_chunks_exact(words, max_tokens, model, encoding)
+        return
 
-    chunks: list[str] = []
     current_words: list[str] = []
+    current_chars = 0
+    current_tokens = 0
+    chars_per_token_x10 = _chars_per_token_x10_for_model(model)
 
+    # Track the estimate of " ".join(current_words) incrementally instead of
+    # rebuilding and re-counting the candidate text for every word. Words
+    # contain no whitespace, so the whitespace count is len(current_words).
+    # The running estimate equals estimate_token_count() of the joined chunk,
+    # so it is yielded alongside it.
     for word in words:
-        candidate_words = current_words + [word]
-        candidate_text = " ".join(candidate_words)
-        if current_words and estimate_token_count(candidate_text, model=model) > max_tokens:
-            chunks.append(" ".join(current_words))
+        candidate_chars = current_chars + len(word) + (1 if current_words else 0)
+        candidate_tokens = max(
+            len(current_words) + 1,
+            (candidate_chars * 10 + chars_per_token_x10 - 1) // chars_per_token_x10,
+        )
+        if current_words and candidate_tokens > max_tokens:
+            yield " ".join(current_words), current_tokens
             current_words = [word]
+            current_chars = len(word)
+            current_tokens = max(1, (current_chars * 10 + chars_per_token_x10 - 1) // chars_per_token_x10)
         else:
-            current_words = candidate_words
+            current_words.append(word)
+            current_chars = candidate_chars
+            current_tokens = candidate_tokens
 
     if current_words:
-        chunks.append(" ".join(current_words))
+        yield " ".join(current_words), current_tokens
 
-    return chunks
 
+def _iter_segment_chunks_exact(
+    words: list[str], max_tokens: int, model: str, encoding
+) -> Iterator[tuple[str, int]]:
+    # tiktoken splits text into space-prefixed pieces before encoding, so the
+    # cost of appending " word" is close to encoding it on its own. Emitted
+    # chunks are re-counted exactly.
+    current_words: list[str] = []
+    current_tokens = 0
+    for word in words:
+        piece = f" {word}" if current_words else word
+        word_tokens = len(encoding.encode(piece, disallowed_special=()))
+        if current_words and current_tokens + word_tokens > max_tokens:
+            chunk = " ".join(current_words)
+            yield chunk, _estimate_tokens(chunk, model)
+            current_words = [word]
+            current_tokens = len(encoding.encode(word, disallowed_special=()))
+        else:
+            current_words.append(word)
+            current_tokens += word_tokens
 
-def _calculate_overlap_segments(segments: list[str], overlap_tokens: int, model: str) -> tuple[list[str], int]:
-    if overlap_tokens <= 0 or not segments:
-        return [], 0
-    overlap_segments: list[str] = []
+    if current_words:
+        chunk = " ".join(current_words)
+        yield chunk, _estimate_tokens(chunk, model)
+
+
+def _calculate_overlap_start(token_counts: list[int], overlap_tokens: int) -> tuple[int, int]:
+    """Return ``(start_index, tokens)`` of the trailing segments reused as overlap."""
+    if overlap_tokens <= 0 or not token_counts:
+        return len(token_counts), 0
     used_tokens = 0
-    for segment in reversed(segments):
-        token_count = estimate_token_count(segment, model=model)
-        if token_count == 0:
-            continue
-        overlap_segments.append(segment)
-        used_tokens += token_count
-        if used_tokens >= overlap_tokens:
-            break
-    overlap_segments.reverse()
-    return overlap_segments, used_tokens
+    start = len(token_counts)
+    while start > 0 and used_tokens < overlap_tokens:
+        start -= 1
+        used_tokens += token_counts[start]
+    return start, used_tokens
 
 
 def _join_segments(segments: list[str]) -> str:
-    return " ".join(segment.strip() for segment in segments).strip()
+    # Pieces are stripped and non-empty, so the joined result needs no strip.
+    return " ".join([stripped for segment in segments if (stripped := segment.strip())])
 
 
 def clean_text(text: str) -> str:
     """
     Clean and normalize text by removing extra whitespace and special characters.
+
+    Results for inputs up to a few thousand characters are memoized, so
+    recurring inputs such as system prompts and templates are only cleaned
+    once. ``clean_text.cache_info()`` and ``clean_text.cache_clear()`` expose
+    the cache.
     
     Args:
         text: The input text to clean
@@ -208,14 +352,34 @@ def clean_text(text: str) -> str:
     """
     if not isinstance(text, str):
         raise TypeError(f"Expected str, got {type(text).__name__}")
-    
-    # Replace multiple whitespace (including newlines, tabs) with single space
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Strip leading and trailing whitespace
-    text = text.strip()
-    
-    return text
+
+    if len(text) > _TEXT_CACHE_MAX_CHARS:
+        return _clean_text_cached.__wrapped__(text)
+    return _clean_text_cached(text)
+
+
+@lru_cache(maxsize=2048)
+def _clean_text_cached(text: str) -> str:
+    # Already-canonical ASCII text (single spaces only, nothing to strip) is
+    # returned as-is; these substring checks are far cheaper than split/join.
+    if (
+        text.isascii()
+        and text[:1] != " "
+        and text[-1:] != " "
+        and "  " not in text
+        and not any(char in text for char in _ASCII_NON_SPACE_WHITESPACE)
+    ):
+        return text
+
+    # str.split() drops leading/trailing whitespace and splits on any run of
+    # Unicode whitespace, so re-joining collapses each run to a single space
+    # in one C-level pass (same result as re.sub(r"\s+", " ", text).strip()).
+    return " ".join(text.split())
+
+
+# Expose the cache the way safe_extract_json does.
+clean_text.cache_info = _clean_text_cached.cache_info  # type: ignore[attr-defined]
+clean_text.cache_clear = _clean_text_cached.cache_clear  # type: ignore[attr-defined]
 
 
 def estimate_token_count(text: str, model: str = _DEFAULT_MODEL) -> int:
@@ -225,7 +389,13 @@ def estimate_token_count(text: str, model: str = _DEFAULT_MODEL) -> int:
     The calculation blends whitespace token counts with an approximate
     characters-per-token ratio tuned for popular LLM families. The result is
     sufficient for chunking and guardrail logic without depending on model-
-    specific tokenizers.
+    specific tokenizers. Results for texts up to a few thousand characters are
+    memoized per ``(text, model)`` pair, so chunking loops that re-estimate the
+    same segments only pay for the first call.
+
+    When ``tiktoken`` is installed and the ``AI_UTILS_EXACT_TOKENS`` environment
+    variable is set to ``1`` at import time, models known to ``tiktoken`` are
+    counted exactly instead; other models keep the heuristic.
 
     Args:
         text: The text to estimate tokens for.
@@ -248,18 +418,71 @@ def estimate_token_count(text: str, model: str = _DEFAULT_MODEL) -> int:
     if not isinstance(model, str):
         raise TypeError(f"model must be str, got {type(model).__name__}")
 
-    normalized_model = _normalized_model_name(model)
+    _, model_lower = _normalize_model(model)
+
+    return _estimate_tokens(text, model_lower)
 
-    if not text.strip():
+
+def _estimate_tokens(text: str, model_lower: str) -> int:
+    """Estimate tokens, memoizing only texts of up to ``_TEXT_CACHE_MAX_CHARS``."""
+    if len(text) > _TEXT_CACHE_MAX_CHARS:
+        return _estimate_token_count_cached.__wrapped__(text, model_lower)
+    return _estimate_token_count_cached(text, model_lower)
+
+
+@lru_cache(maxsize=8192)
+def _estimate_token_count_cached(text: str, model_lower: str) -> int:
+    """Memoized core of :func:`estimate_token_count` keyed by ``(text, model)``."""
+    # isspace() scans without allocating a stripped copy of the text.
+    if not text or text.isspace():
         return 0
 
+    encoding = _exact_encoding_for_model(model_lower)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+
     whitespace_tokens = len(text.split())
-    chars_per_token = _chars_per_token_for_model(normalized_model.lower())
-    approx_by_chars = max(1, math.ceil(len(text) / chars_per_token))
+    chars_per_token_x10 = _chars_per_token_x10_for_model(model_lower)
+    approx_by_chars = (len(text) * 10 + chars_per_token_x10 - 1) // chars_per_token_x10 or 1
 
     return max(whitespace_tokens, approx_by_chars)
 
 
+def estimate_token_counts_batch(texts: list[str], model: str = _DEFAULT_MODEL) -> list[int]:
+    """
+    Estimate token counts for many texts against the same model in one call.
+
+    The model name is validated and normalized once for the whole batch, and
+    each text goes through the same memoized estimator as
+    :func:`estimate_token_count`, so duplicated prompts are only counted once.
+
+    Args:
+        texts: The texts to estimate tokens for.
+        model: The target model name (used to select a heuristic ratio).
+
+    Returns:
+        Estimated token counts, aligned with ``texts``.
+
+    Examples:
+        >>> estimate_token_counts_batch(["Hello world!", ""], model="gpt-3.5-turbo")
+        [3, 0]
+    """
+    if not isinstance(texts, list):
+        raise TypeError(f"Expected list, got {type(texts).__name__}")
+
+    if not isinstance(model, str):
+        raise TypeError(f"model must be str, got {type(model).__name__}")
+
+    _, model_lower = _normalize_model(model)
+
+    counts: list[int] = []
+    for text in texts:
+        if not isinstance(text, str):
+            raise TypeError(f"Expected str, got {type(text).__name__}")
+        counts.append(_estimate_tokens(text, model_lower))
+    return counts
+
+
 def safe_truncate_tokens(text: str, max_tokens: int, model: str = _DEFAULT_MODEL) -> str:
     """
     Truncate text to a target token budget while respecting sentence boundaries.
@@ -292,17 +515,20 @@ def safe_truncate_tokens(text: str, max_tokens: int, model: str = _DEFAULT_MODEL
     if not isinstance(model, str):
         raise TypeError(f"model must be str, got {type(model).__name__}")
 
-    normalized_model = _normalized_model_name(model)
+    # Internal helpers take the lower-cased model so they can hit the
+    # token-count cache directly.
+    _, model_lower = _normalize_model(model)
 
     if not text.strip() or max_tokens == 0:
         return ""
 
-    sentences = _split_sentences(text)
     truncated_segments: list[str] = []
     tokens_used = 0
 
-    for sentence in sentences:
-        sentence_tokens = estimate_token_count(sentence, model=normalized_model)
+    # Sentences are produced lazily, so long inputs are only scanned up to
+    # the point where the token budget runs out.
+    for sentence in _iter_sentences(text):
+        sentence_tokens = _estimate_tokens(sentence, model_lower)
         if sentence_tokens == 0:
             continue
 
@@ -314,15 +540,25 @@ def safe_truncate_tokens(text: str, max_tokens: int, model: str = _DEFAULT_MODEL
         remaining = max_tokens - tokens_used
         if remaining <= 0:
             break
-        partial = _truncate_segment(sentence, remaining, normalized_model)
+        partial = _truncate_segment(sentence, remaining, model_lower)
         if partial:
             truncated_segments.append(partial)
         break
 
     if not truncated_segments:
-        return _truncate_segment(text, max_tokens, normalized_model)
+        return _truncate_segment(text, max_tokens, model_lower)
 
-    return _join_segments(truncated_segments)
+    result = _join_segments(truncated_segments)
+    # Per-sentence estimates round up separately, so the joined text can land
+    # a token over budget; trim the last segment until it fits.
+    while truncated_segments and _estimate_tokens(result, model_lower) > max_tokens:
+        last = truncated_segments.pop()
+        budget = _estimate_tokens(last, model_lower) - 1
+        shorter = _truncate_segment(last, budget, model_lower)
+        if shorter and _estimate_tokens(shorter, model_lower) <= budget:
+            truncated_segments.append(shorter)
+        result = _join_segments(truncated_segments)
+    return result
 
 
 def merge_context_snippets(snippets: list[str], separator: str = "\n\n") -> str:
@@ -353,8 +589,10 @@ def merge_context_snippets(snippets: list[str], separator: str = "\n\n") -> str:
     if not isinstance(separator, str):
         raise TypeError(f"Expected str for separator, got {type(separator).__name__}")
 
-    # Filter out empty or whitespace-only snippets
-    non_empty_snippets = [s.strip() for s in snippets if isinstance(s, str) and s.strip()]
+    # Filter out empty or whitespace-only snippets, stripping each one once
+    non_empty_snippets = [
+        stripped for s in snippets if isinstance(s, str) and (stripped := s.strip())
+    ]
 
     # Join with the separator
     return separator.join(non_empty_snippets)
@@ -384,6 +622,36 @@ def split_into_chunks(
         >>> len(chunks) >= 2
         True
     """
+    return list(iter_chunks(text, max_tokens, overlap_tokens=overlap_tokens, model=model))
+
+
+def iter_chunks(
+    text: str,
+    max_tokens: int,
+    overlap_tokens: int = 0,
+    model: str = _DEFAULT_MODEL,
+) -> Iterator[str]:
+    """
+    Lazily yield the same chunks as :func:`split_into_chunks`.
+
+    Arguments are validated immediately; chunks are produced as the text is
+    scanned, so streaming consumers can start on the first chunk (or stop
+    early) without the whole document being split up front.
+
+    Args:
+        text: Source document or API response to split.
+        max_tokens: Maximum estimated tokens per chunk.
+        overlap_tokens: Tokens to repeat between consecutive chunks for context.
+        model: Target model name used for token estimation.
+
+    Returns:
+        Iterator over chunk strings that include the requested overlap.
+
+    Examples:
+        >>> chunks = iter_chunks("First sentence. Second sentence.", max_tokens=4)
+        >>> next(chunks)
+        'First sentence.'
+    """
     if not isinstance(text, str):
         raise TypeError(f"Expected str, got {type(text).__name__}")
 
@@ -399,66 +667,137 @@ def split_into_chunks(
     if not isinstance(model, str):
         raise TypeError(f"model must be str, got {type(model).__name__}")
 
-    normalized_model = _normalized_model_name(model)
+    # Internal helpers take the lower-cased model so they can hit the
+    # token-count cache directly.
+    _, model_lower = _normalize_model(model)
 
-    if not text.strip():
-        return []
+    return _iter_chunks(text, max_tokens, overlap_tokens, model_lower)
 
-    sentences = _split_sentences(text)
-    segments: list[str] = []
-    for sentence in sentences:
-        if not sentence:
-            continue
-        if estimate_token_count(sentence, model=normalized_model) <= max_tokens:
-            segments.append(sentence)
-        else:
-            segments.extend(_split_segment_into_chunks(sentence, max_tokens, normalized_model))
 
-    chunks: list[str] = []
+def _iter_chunks(text: str, max_tokens: int, overlap_tokens: int, model_lower: str) -> Iterator[str]:
+    if not text or text.isspace():
+        return
+
+    # Every heuristic estimate is at most one token per character, so text no
+    # longer than max_tokens always fits in a single chunk. (Exact tokenizers
+    # can emit several tokens per character, so they take the full path.)
+    if len(text) <= max_tokens and _exact_encoding_for_model(model_lower) is None:
+        yield _join_segments(list(_iter_sentences(text)))
+        return
+
     current_segments: list[str] = []
+    # Token count of each entry in current_segments, kept so the overlap can
+    # be sized by summing ints instead of re-estimating the tail segments.
+    current_counts: list[int] = []
     current_tokens = 0
 
-    def flush_chunk(add_overlap: bool) -> None:
-        nonlocal current_segments, current_tokens
-        if not current_segments:
-            return
-        chunks.append(_join_segments(current_segments))
+    def flush_chunk(add_overlap: bool) -> str:
+        # The buffers are trimmed in place and reused for the next chunk.
+        nonlocal current_tokens
+        chunk = _join_segments(current_segments)
         if add_overlap and overlap_tokens > 0:
-            overlap_segments, _ = _calculate_overlap_segments(current_segments, overlap_tokens, normalized_model)
-            current_segments = overlap_segments.copy()
-            current_tokens = sum(
-                estimate_token_count(seg, model=normalized_model) for seg in current_segments
-            )
+            start, current_tokens = _calculate_overlap_start(current_counts, overlap_tokens)
+            del current_segments[:start]
+            del current_counts[:start]
         else:
-            current_segments = []
+            current_segments.clear()
+            current_counts.clear()
             current_tokens = 0
+        return chunk
 
-    for segment in segments:
-        seg_tokens = estimate_token_count(segment, model=normalized_model)
+    def add_segment(segment: str, seg_tokens: int) -> Iterator[str]:
+        nonlocal current_tokens
         if seg_tokens == 0:
-            continue
+            return
 
         if current_tokens + seg_tokens > max_tokens and current_segments:
-            flush_chunk(add_overlap=True)
+            yield flush_chunk(add_overlap=True)
 
         if seg_tokens > max_tokens:
-            smaller_chunks = _split_segment_into_chunks(segment, max_tokens, normalized_model)
-            for small in smaller_chunks:
-                small_tokens = estimate_token_count(small, model=normalized_model)
+            for small, small_tokens in _iter_segment_chunks(segment, max_tokens, model_lower):
                 if current_tokens + small_tokens > max_tokens and current_segments:
-                    flush_chunk(add_overlap=True)
+                    yield flush_chunk(add_overlap=True)
                 current_segments.append(small)
+                current_counts.append(small_tokens)
                 current_tokens += small_tokens
                 if current_tokens >= max_tokens:
-                    flush_chunk(add_overlap=True)
-            continue
+                    yield flush_chunk(add_overlap=True)
+            return
 
         current_segments.append(segment)
+        current_counts.append(seg_tokens)
         current_tokens += seg_tokens
 
-    flush_chunk(add_overlap=False)
+    # Single pass: oversized sentences are split lazily and each piece is
+    # folded into the running chunk as soon as it is produced.
+    for sentence in _iter_sentences(text):
+        sentence_tokens = _estimate_tokens(sentence, model_lower)
+        if sentence_tokens <= max_tokens:
+            yield from add_segment(sentence, sentence_tokens)
+        else:
+            for piece, piece_tokens in _iter_segment_chunks(sentence, max_tokens, model_lower):
+                yield from add_segment(piece, piece_tokens)
+
+    if current_segments:
+        yield flush_chunk(add_overlap=False)
+
 
-    return chunks
+def get_model_pricing(
+    model: str,
+    pricing_overrides: dict[str, dict[str, float]] | None = None,
+) -> tuple[float, float]:
+    """
+    Look up the ``(input, output)`` USD price per 1K tokens for a model.
+
+    Resolve prices once per model and reuse them when costing many requests,
+    instead of letting every :func:`estimate_llm_cost` call repeat the lookup.
+    Lookups without overrides are cached.
+
+    Args:
+        model: Model name matched by prefix against the pricing table.
+        pricing_overrides: Optional mapping of model prefixes to ``{"input": x, "output": y}``
+            values expressed in USD per 1K tokens.
+
+    Returns:
+        Tuple of ``(input_price, output_price)`` in USD per 1K tokens.
+
+    Examples:
+        >>> get_model_pricing("gpt-4o")
+        (0.005, 0.015)
+        >>> get_model_pricing("custom-model", pricing_overrides={"custom": {"input": 0.002}})
+        (0.002, 0.002)
+    """
+    if not isinstance(model, str):
+        raise TypeError(f"model must be str, got {type(model).__name__}")
+
+    normalized_model, _ = _normalize_model(model)
+
+    if pricing_overrides:
+        pricing = _pricing_for_model(normalized_model, pricing_overrides)
+        return pricing["input"], pricing["output"]
+    return _cached_model_pricing(normalized_model)
+
+
+@lru_cache(maxsize=256)
+def _cached_model_pricing(model: str) -> tuple[float, float]:
+    pricing = _pricing_for_model(model)
+    return pricing["input"], pricing["output"]
+
+
+def _per_token_prices(
+    model: str, pricing_overrides: dict[str, dict[str, float]] | None = None
+) -> tuple[float, float]:
+    """Return ``(input, output)`` USD per single token for a normalized model name."""
+    if pricing_overrides:
+        pricing = _pricing_for_model(model, pricing_overrides)
+        return pricing["input"] / 1000, pricing["output"] / 1000
+    return _cached_per_token_prices(model)
+
+
+@lru_cache(maxsize=256)
+def _cached_per_token_prices(model: str) -> tuple[float, float]:
+    input_price, output_price = _cached_model_pricing(model)
+    return input_price / 1000, output_price / 1000
 
 
 def estimate_llm_cost(
@@ -494,20 +833,90 @@ def estimate_llm_cost(
     if not isinstance(model, str):
         raise TypeError(f"model must be str, got {type(model).__name__}")
 
-    normalized_model = _normalized_model_name(model)
-    prompt_tokens = estimate_token_count(text, model=normalized_model)
+    normalized_model, model_lower = _normalize_model(model)
+    prompt_tokens = _estimate_tokens(text, model_lower)
 
     if expected_response_tokens is not None:
         if not isinstance(expected_response_tokens, int) or expected_response_tokens < 0:
             raise ValueError("expected_response_tokens must be a non-negative integer or None")
         completion_tokens = expected_response_tokens
     else:
-        completion_tokens = math.ceil(prompt_tokens * 0.25)
+        # ceil(prompt_tokens * 0.25) in integer arithmetic
+        completion_tokens = (prompt_tokens + 3) // 4
+
+    input_per_token, output_per_token = _per_token_prices(normalized_model, pricing_overrides)
+    return round(prompt_tokens * input_per_token + completion_tokens * output_per_token, 8)
+
+
+def estimate_llm_cost_batch(
+    texts: list[str],
+    model: str,
+    *,
+    expected_response_tokens: int | None = None,
+    pricing_overrides: dict[str, dict[str, float]] | None = None,
+) -> list[float]:
+    """
+    Estimate the USD cost of many LLM calls against the same model.
+
+    Pricing is resolved and the model validated once for the whole batch;
+    each entry equals what :func:`estimate_llm_cost` returns for that text.
+
+    Args:
+        texts: Prompt texts being sent to the model.
+        model: Target model name used for both token estimation and pricing lookup.
+        expected_response_tokens: Optional expected completion tokens per call. When
+            omitted, a conservative 25%% of each prompt's tokens is assumed.
+        pricing_overrides: Optional mapping of model prefixes to ``{"input": x, "output": y}``
+            values expressed in USD per 1K tokens.
+
+    Returns:
+        Estimated dollar costs, aligned with ``texts``.
+
+    Examples:
+        >>> estimate_llm_cost_batch(["Hello world", "Hello"], model="gpt-4o")
+        [3.5e-05, 2.5e-05]
+    """
+    if not isinstance(texts, list):
+        raise TypeError(f"Expected list, got {type(texts).__name__}")
+
+    if not isinstance(model, str):
+        raise TypeError(f"model must be str, got {type(model).__name__}")
+
+    if expected_response_tokens is not None:
+        if not isinstance(expected_response_tokens, int) or expected_response_tokens < 0:
+            raise ValueError("expected_response_tokens must be a non-negative integer or None")
+
+    normalized_model, model_lower = _normalize_model(model)
+    input_per_token, output_per_token = _per_token_prices(normalized_model, pricing_overrides)
+
+    costs: list[float] = []
+    for text in texts:
+        if not isinstance(text, str):
+            raise TypeError(f"Expected str for text, got {type(text).__name__}")
+        prompt_tokens = _estimate_tokens(text, model_lower)
+        if expected_response_tokens is not None:
+            completion_tokens = expected_response_tokens
+        else:
+            completion_tokens = (prompt_tokens + 3) // 4
+        costs.append(round(prompt_tokens * input_per_token + completion_tokens * output_per_token, 8))
+    return costs
+
+
+def _last_summary_boundary(text: str, floor: int) -> re.Match[str] | None:
+    # Walk terminal punctuation backwards from the end and test the boundary
+    # pattern right after each one, so only the tail of the text is scanned.
+    # The lookbehind still sees the punctuation before the match position.
+    end = len(text)
+    while end > floor:
+        position = max(text.rfind(".", floor, end), text.rfind("!", floor, end), text.rfind("?", floor, end))
+        if position < 0:
+            return None
+        match = _SUMMARY_SENTENCE_PATTERN.match(text, position + 1)
+        if match is not None:
+            return match
+        end = position
+    return None
 
-    pricing = _pricing_for_model(normalized_model, pricing_overrides)
-    prompt_cost = (prompt_tokens / 1000) * pricing["input"]
-    completion_cost = (completion_tokens / 1000) * pricing["output"]
-    return round(prompt_cost + completion_cost, 8)
 
 def summarise_text(text: str, max_chars: int) -> str:
     """
@@ -516,6 +925,9 @@ def summarise_text(text: str, max_chars: int) -> str:
     This function uses a sentence-based heuristic to summarize text by keeping
     the first and last portions when the text exceeds max_chars. It attempts to
     preserve complete sentences and adds an ellipsis to indicate omitted content.
+    Results for texts up to a few thousand characters are memoized per
+    ``(text, max_chars)``, so summarizing the same prompt across many requests
+    only does the work once.
 
     Args:
         text: The input text to summarize
@@ -544,30 +956,41 @@ def summarise_text(text: str, max_chars: int) -> str:
     if len(text) <= max_chars:
         return text
 
-    # Split into sentences using basic sentence splitting
-    # This handles periods followed by space and capital letter
-    sentence_pattern = r'(?<=[.!?])\s+(?=[A-Z])'
-    sentences = re.split(sentence_pattern, text.strip())
+    if len(text) > _TEXT_CACHE_MAX_CHARS:
+        return _summarise_text_cached.__wrapped__(text, max_chars)
+    return _summarise_text_cached(text, max_chars)
+
+
+@lru_cache(maxsize=1024)
+def _summarise_text_cached(text: str, max_chars: int) -> str:
+    # Only the first and last sentences are used, so locate the first and
+    # last boundaries instead of materializing every sentence. Boundaries are
+    # a period/!/? followed by whitespace and a capital letter.
+    stripped = text.strip()
+    first_boundary = last_boundary = None
+    # Text without terminal punctuation is a single sentence; skip the regex.
+    if "." in text or "!" in text or "?" in text:
+        first_boundary = _SUMMARY_SENTENCE_PATTERN.search(stripped)
+        if first_boundary is not None:
+            last_boundary = _last_summary_boundary(stripped, first_boundary.start() - 1)
 
     # If only one sentence, truncate it
-    if len(sentences) == 1:
+    if first_boundary is None or last_boundary is None:
         if max_chars < 10:
             return text[:max_chars]
         return text[:max_chars - 3] + "..."
 
     # Try to keep first and last sentences
-    ellipsis = " ... "
-    first_sentence = sentences[0]
-    last_sentence = sentences[-1]
+    first_sentence = stripped[:first_boundary.start()]
+    last_sentence = stripped[last_boundary.end():]
 
     # If even first + last is too long, truncate
-    combined = first_sentence + ellipsis + last_sentence
-    if len(combined) <= max_chars:
-        return combined
+    if len(first_sentence) + _SUMMARY_ELLIPSIS_LEN + len(last_sentence) <= max_chars:
+        return f"{first_sentence}{_SUMMARY_ELLIPSIS}{last_sentence}"
 
     # Try to fit as much of first sentence and last sentence as possible
-    space_for_first = (max_chars - len(ellipsis) - len(last_sentence)) // 2
-    space_for_last = max_chars - len(ellipsis) - space_for_first
+    space_for_first = (max_chars - _SUMMARY_ELLIPSIS_LEN - len(last_sentence)) // 2
+    space_for_last = max_chars - _SUMMARY_ELLIPSIS_LEN - space_for_first
 
     if space_for_first > 0 and space_for_last > 0:
         # Truncate first sentence
@@ -586,19 +1009,39 @@ def summarise_text(text: str, max_chars: int) -> str:
     return text[:max_chars - 3] + "..."
 
 
+def __getattr__(name: str):
+    # LLMClient pulls in requests (and urllib3), which dominates import time,
+    # so it is only imported the first time it is accessed.
+    if name == "LLMClient":
+        from .llm_client import LLMClient
+
+        globals()["LLMClient"] = LLMClient
+        return LLMClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | {"LLMClient"})
+
+
 __all__ = [
     # Text processing
     "clean_text",
     "estimate_token_count",
+    "estimate_token_counts_batch",
     "safe_truncate_tokens",
     "merge_context_snippets",
     "split_into_chunks",
+    "iter_chunks",
     "estimate_llm_cost",
+    "estimate_llm_cost_batch",
+    "get_model_pricing",
     "summarise_text",
     # LLM integration
     "LLMClient",
     # Additional helpers
     "safe_extract_json",
+    "safe_extract_json_batch",
     "configure_logging",
     "retry_with_backoff",
 ]
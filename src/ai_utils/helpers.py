@@ -1,20 +1,143 @@
 """Additional utility helpers for AI workflows."""
 
+import asyncio
+import copy
+import functools
+import inspect
 import json
 import logging
+import random
 import re
 import sys
-from typing import Any, Callable, Optional, Union
+import time
+from functools import lru_cache
+from typing import Any, Callable, Iterator, Optional, Union
+
+# Use orjson for parsing when it is installed; it is several times faster than
+# json.loads, which is still used wherever the two could disagree.
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+if orjson is not None:
+    # orjson turns integers wider than 64 bits into floats, so any input with
+    # a 19+ digit run goes straight to json.loads to keep exact ints.
+    _WIDE_NUMBER_STR = re.compile(r'[0-9]{19}')
+    _WIDE_NUMBER_BYTES = re.compile(rb'[0-9]{19}')
+
+    def _json_loads(data: Union[str, bytes, bytearray]) -> Any:
+        if isinstance(data, str):
+            exact_ints_only = _WIDE_NUMBER_STR.search(data) is None
+        else:
+            exact_ints_only = _WIDE_NUMBER_BYTES.search(data) is None
+        if exact_ints_only:
+            try:
+                return orjson.loads(data)
+            except ValueError:
+                # NaN/Infinity, lone surrogates and out-of-range floats are
+                # rejected by orjson but accepted by json.loads.
+                pass
+        return json.loads(data)
+else:
+    _json_loads = json.loads
+
+# json5 accepts single quotes, unquoted keys and comments; it is only used by
+# safe_extract_json(..., lenient=True) after strict parsing has failed.
+try:
+    import json5
+except ImportError:
+    json5 = None  # type: ignore
+
+
+_CODE_BLOCK_PATTERNS = (
+    re.compile(r'```json\s*(.*?)\s*```', re.DOTALL),  # ```json ... ```
+    re.compile(r'```\s*(.*?)\s*```', re.DOTALL),       # ``` ... ```
+    re.compile(r'`(.*?)`', re.DOTALL),                 # ` ... `
+)
+# Without a ``` fence only the inline pattern can match.
+_INLINE_CODE_PATTERNS = _CODE_BLOCK_PATTERNS[2:]
+
+# raw_decode both validates a candidate and reports where it ends, so one
+# decoder can walk the text without any brace-matching regexes.
+_DECODER = json.JSONDecoder()
+
+# First characters a complete JSON document can start with (N and I cover the
+# NaN/Infinity literals, which _json_loads hands to the stdlib parser).
+_JSON_START_CHARS = frozenset('{["-0123456789tfnNI')
+
+_TRAILING_COMMA_PATTERN = re.compile(r',(\s*[}\]])')
+
+# safe_extract_json(..., cache=True) skips the cache for texts longer than
+# this, so a few huge responses cannot pin large strings in memory.
+JSON_CACHE_MAX_CHARS = 1 << 20
+
+# Returned by the extraction core when nothing parses; callers map it to their
+# own ``default`` so unhashable defaults never reach the cache.
+_NOT_FOUND = object()
 
 
 class _RetryResultTrigger(Exception):
     """Internal exception raised when retry_on_result requests a retry."""
 
 
+def _iter_embedded_json(text: str):
+    """Yield each JSON object/array embedded in ``text``, left to right."""
+    find = text.find
+    next_brace = find('{')
+    next_bracket = find('[')
+
+    while next_brace != -1 or next_bracket != -1:
+        if next_bracket == -1 or (next_brace != -1 and next_brace < next_bracket):
+            index = next_brace
+        else:
+            index = next_bracket
+
+        try:
+            parsed, index = _DECODER.raw_decode(text, index)
+        except ValueError:
+            index += 1
+        else:
+            yield parsed
+
+        # Only re-scan for a delimiter once the cursor has moved past it.
+        if next_brace != -1 and next_brace < index:
+            next_brace = find('{', index)
+        if next_bracket != -1 and next_bracket < index:
+            next_bracket = find('[', index)
+
+
+def _lenient_parse(text: str) -> Any:
+    """Parse the outermost {...} or [...] span of ``text`` leniently.
+
+    Raises:
+        ValueError: If the span cannot be parsed even leniently.
+    """
+    starts = [index for index in (text.find('{'), text.find('[')) if index != -1]
+    if not starts:
+        raise ValueError("No JSON object or array found")
+
+    start = min(starts)
+    end = text.rfind('}' if text[start] == '{' else ']')
+    if end <= start:
+        raise ValueError("Unterminated JSON object or array")
+
+    candidate = text[start:end + 1]
+    try:
+        return _json_loads(_TRAILING_COMMA_PATTERN.sub(r'\1', candidate))
+    except json.JSONDecodeError:
+        if json5 is None:
+            raise
+    return json5.loads(candidate)
+
+
 def safe_extract_json(
-    text: str,
+    text: Union[str, bytes],
     default: Any = None,
-    allow_multiple: bool = False
+    allow_multiple: bool = False,
+    lenient: bool = False,
+    cache: bool = False,
+    copy_result: bool = False
 ) -> Union[dict, list, Any]:
     """
     Safely extract JSON from text that may contain additional content.
@@ -24,9 +147,21 @@ def safe_extract_json(
     multiple strategies to find and parse valid JSON.
 
     Args:
-        text: The input text that may contain JSON
+        text: The input text that may contain JSON. Raw UTF-8 ``bytes`` (for
+            example ``response.content``) are accepted and parsed directly
         default: Value to return if no valid JSON is found (default: None)
         allow_multiple: If True, returns list of all found JSON objects (default: False)
+        lenient: If True, retry the outermost object/array with trailing commas
+            removed, then with ``json5`` when installed, before giving up
+            (default: False). Only runs after every strict strategy failed.
+        cache: If True, memoize results for ``str`` inputs of up to
+            ``JSON_CACHE_MAX_CHARS`` characters in a shared LRU cache, so
+            re-parsing the same response is a dictionary lookup (default:
+            False). Cached values are shared between calls; treat them as
+            read-only or pass ``copy_result=True``. Use
+            ``safe_extract_json.cache_clear()`` to empty the cache.
+        copy_result: If True, return a deep copy of a cached value so the
+            caller may mutate it (default: False). Ignored without ``cache``.
 
     Returns:
         Parsed JSON object(s), or default value if parsing fails
@@ -47,86 +182,175 @@ def safe_extract_json(
         >>> text = 'First: {"a": 1} Second: {"b": 2}'
         >>> safe_extract_json(text, allow_multiple=True)
         [{'a': 1}, {'b': 2}]
+
+        >>> safe_extract_json('Result: {"a": 1, "b": [2, 3,],}', lenient=True)
+        {'a': 1, 'b': [2, 3]}
+
+        >>> safe_extract_json('Data: {"a": 1}', cache=True, copy_result=True)
+        {'a': 1}
     """
+    parsed_directly = False
+    if isinstance(text, (bytes, bytearray)):
+        # Raw response bodies: both parsers read UTF-8 bytes natively, so a
+        # clean JSON body is parsed without ever being decoded to str.
+        try:
+            return _json_loads(text)
+        except ValueError:
+            parsed_directly = True
+        text = bytes(text).decode('utf-8', errors='replace')
+    elif cache and isinstance(text, str) and len(text) <= JSON_CACHE_MAX_CHARS:
+        result = _extract_json_cached(text, allow_multiple, lenient)
+        if result is _NOT_FOUND:
+            return default
+        return copy.deepcopy(result) if copy_result else result
+
     if not isinstance(text, str):
-        raise TypeError(f"Expected str, got {type(text).__name__}")
+        raise TypeError(f"Expected str or bytes, got {type(text).__name__}")
 
-    if not text.strip():
-        return default
+    result = _extract_json(text, allow_multiple, lenient, parsed_directly)
+    return default if result is _NOT_FOUND else result
 
-    # Strategy 1: Try direct JSON parsing
-    try:
-        return json.loads(text.strip())
-    except json.JSONDecodeError:
-        pass
 
-    # Strategy 2: Extract from markdown code blocks
-    code_block_patterns = [
-        r'```json\s*(.*?)\s*```',  # ```json ... ```
-        r'```\s*(.*?)\s*```',       # ``` ... ```
-        r'`(.*?)`',                 # ` ... `
-    ]
+@lru_cache(maxsize=2048)
+def _extract_json_cached(text: str, allow_multiple: bool, lenient: bool) -> Any:
+    """Memoized :func:`_extract_json` for ``safe_extract_json(..., cache=True)``."""
+    return _extract_json(text, allow_multiple, lenient, False)
 
-    for pattern in code_block_patterns:
-        matches = re.findall(pattern, text, re.DOTALL)
-        if matches:
-            for match in matches:
-                try:
-                    parsed = json.loads(match.strip())
-                    if allow_multiple:
-                        continue  # Keep looking for more
-                    return parsed
-                except json.JSONDecodeError:
-                    continue
 
-    # Strategy 3: Find JSON object/array patterns
-    # Look for {...} or [...]
-    json_patterns = [
-        r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}',  # Nested objects
-        r'\[[^\[\]]*(?:\[[^\[\]]*\][^\[\]]*)*\]',  # Nested arrays
-    ]
+# Expose the shared cache the way the other memoized helpers do.
+safe_extract_json.cache_info = _extract_json_cached.cache_info  # type: ignore[attr-defined]
+safe_extract_json.cache_clear = _extract_json_cached.cache_clear  # type: ignore[attr-defined]
 
-    found_objects = []
 
-    for pattern in json_patterns:
-        matches = re.finditer(pattern, text, re.DOTALL)
-        for match in matches:
-            try:
-                parsed = json.loads(match.group())
-                if allow_multiple:
-                    found_objects.append(parsed)
-                else:
-                    return parsed
-            except json.JSONDecodeError:
-                continue
-
-    if allow_multiple and found_objects:
-        return found_objects
-
-    # Strategy 4: Try to extract content between first { and last }
-    first_brace = text.find('{')
-    last_brace = text.rfind('}')
-
-    if first_brace != -1 and last_brace != -1 and last_brace > first_brace:
-        potential_json = text[first_brace:last_brace + 1]
+def _extract_json(text: str, allow_multiple: bool, lenient: bool, parsed_directly: bool) -> Any:
+    """Run the extraction strategies on ``text``; return _NOT_FOUND on failure."""
+    stripped = text.strip()
+    if not stripped:
+        return _NOT_FOUND
+
+    # Strategy 1: Try direct JSON parsing, but only when the text could start
+    # a JSON value; prose-wrapped responses skip straight to the scans.
+    if not parsed_directly and stripped[0] in _JSON_START_CHARS:
         try:
-            return json.loads(potential_json)
+            return _json_loads(stripped)
         except json.JSONDecodeError:
             pass
 
-    # Strategy 5: Try with [ and ]
-    first_bracket = text.find('[')
-    last_bracket = text.rfind(']')
+    has_code = '`' in text
+    if not has_code and '{' not in text and '[' not in text:
+        # Nothing below can match without a code span or a delimiter.
+        return _NOT_FOUND
+
+    # Strategy 2: Extract from markdown code blocks. With allow_multiple the
+    # embedded-value scan below already collects these, so skip the pass.
+    if has_code and not allow_multiple:
+        patterns = _CODE_BLOCK_PATTERNS if '```' in text else _INLINE_CODE_PATTERNS
+        for pattern in patterns:
+            for match in pattern.finditer(text):
+                try:
+                    return _json_loads(match.group(1).strip())
+                except json.JSONDecodeError:
+                    continue
 
-    if first_bracket != -1 and last_bracket != -1 and last_bracket > first_bracket:
-        potential_json = text[first_bracket:last_bracket + 1]
+    # Strategy 3: Decode every {...} or [...] value embedded in the text.
+    # A value that starts at the first brace and ends at the last one is
+    # found here too, so no separate first/last delimiter pass is needed.
+    if allow_multiple:
+        found_objects = list(_iter_embedded_json(text))
+        if found_objects:
+            return found_objects
+    else:
+        # Objects win over arrays wherever they appear, so a citation such as
+        # "[1]" in the prose does not shadow the JSON object that follows.
+        first_array = _NOT_FOUND
+        for parsed in _iter_embedded_json(text):
+            if isinstance(parsed, dict):
+                return parsed
+            if first_array is _NOT_FOUND:
+                first_array = parsed
+        if first_array is not _NOT_FOUND:
+            return first_array
+
+    # Strategy 4: Repair common LLM mistakes (opt-in, slow path only)
+    if lenient:
         try:
-            return json.loads(potential_json)
-        except json.JSONDecodeError:
+            parsed = _lenient_parse(text)
+        except ValueError:
             pass
+        else:
+            return [parsed] if allow_multiple else parsed
 
     # All strategies failed
-    return default
+    return _NOT_FOUND
+
+
+def safe_extract_json_batch(
+    texts: list[Union[str, bytes]],
+    default: Any = None,
+    allow_multiple: bool = False,
+    lenient: bool = False,
+    cache: bool = False
+) -> list[Any]:
+    """
+    Extract JSON from many LLM responses in one call.
+
+    Each item is handled exactly like :func:`safe_extract_json` with the same
+    options, sharing the module-level decoder and compiled patterns.
+
+    Args:
+        texts: Response texts (or raw UTF-8 bytes) to extract JSON from
+        default: Value used for items where no valid JSON is found
+        allow_multiple: Passed through to :func:`safe_extract_json`
+        lenient: Passed through to :func:`safe_extract_json`
+        cache: Passed through to :func:`safe_extract_json`; useful when the
+            batch repeats responses, as in eval replays
+
+    Returns:
+        Extracted values, aligned with ``texts``
+
+    Examples:
+        >>> safe_extract_json_batch(['{"a": 1}', 'none', 'x: [1, 2]'], default={})
+        [{'a': 1}, {}, [1, 2]]
+    """
+    if not isinstance(texts, list):
+        raise TypeError(f"Expected list, got {type(texts).__name__}")
+
+    return [
+        safe_extract_json(text, default=default, allow_multiple=allow_multiple,
+                          lenient=lenient, cache=cache)
+        for text in texts
+    ]
+
+
+_LEVEL_MAP = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR,
+    'CRITICAL': logging.CRITICAL,
+}
+
+# (level, format_string, stream, handler) installed by the last
+# configure_logging call that reconfigured the root logger.
+_last_logging_config: Optional[tuple] = None
+
+
+@lru_cache(maxsize=8)
+def _default_format_string(include_timestamp: bool, include_level: bool, include_module: bool) -> str:
+    parts = []
+
+    if include_timestamp:
+        parts.append('%(asctime)s')
+
+    if include_level:
+        parts.append('[%(levelname)s]')
+
+    if include_module:
+        parts.append('%(name)s')
+
+    parts.append('%(message)s')
+
+    return ' - '.join(parts)
 
 
 def configure_logging(
@@ -141,7 +365,9 @@ def configure_logging(
     Configure logging with sensible defaults for AI workflows.
 
     This helper makes it easy to set up consistent logging across your projects
-    without having to remember the logging configuration details.
+    without having to remember the logging configuration details. Repeated
+    calls with the same settings keep the handler installed by the first call
+    instead of tearing it down and rebuilding it.
 
     Args:
         level: Logging level (default: logging.INFO). Can be string or int.
@@ -172,49 +398,66 @@ def configure_logging(
     """
     # Convert string level to logging constant
     if isinstance(level, str):
-        level_map = {
-            'DEBUG': logging.DEBUG,
-            'INFO': logging.INFO,
-            'WARNING': logging.WARNING,
-            'ERROR': logging.ERROR,
-            'CRITICAL': logging.CRITICAL,
-        }
-        level = level_map.get(level.upper(), logging.INFO)
+        level = _LEVEL_MAP.get(level.upper(), logging.INFO)
 
     # Build format string if not provided
     if format_string is None:
-        parts = []
-
-        if include_timestamp:
-            parts.append('%(asctime)s')
+        format_string = _default_format_string(include_timestamp, include_level, include_module)
 
-        if include_level:
-            parts.append('[%(levelname)s]')
-
-        if include_module:
-            parts.append('%(name)s')
-
-        parts.append('%(message)s')
-
-        format_string = ' - '.join(parts)
+    global _last_logging_config
+    logger = logging.getLogger()
+    ai_utils_logger = logging.getLogger('ai_utils')
+    stream = stream or sys.stdout
+
+    # Calling again with the same settings is a no-op, as long as nothing has
+    # replaced the handler or levels installed by the previous call.
+    if _last_logging_config is not None:
+        last_level, last_format, last_stream, last_handler = _last_logging_config
+        if (
+            last_level == level
+            and last_format == format_string
+            and last_stream is stream
+            and logger.handlers == [last_handler]
+            and logger.level == level
+            and ai_utils_logger.level == level
+        ):
+            return logger
 
     # Configure logging
     logging.basicConfig(
         level=level,
         format=format_string,
-        stream=stream or sys.stdout,
+        stream=stream,
         force=True  # Reconfigure if already configured
     )
 
-    logger = logging.getLogger()
-
     # Also set level for ai_utils loggers specifically
-    ai_utils_logger = logging.getLogger('ai_utils')
     ai_utils_logger.setLevel(level)
 
+    handler = logger.handlers[0] if len(logger.handlers) == 1 else None
+    _last_logging_config = (level, format_string, stream, handler)
+
     return logger
 
 
+def _retry_delays(
+    max_retries: int,
+    initial_delay: float,
+    backoff_factor: float,
+    jitter: bool,
+) -> Iterator[float]:
+    """Yield the sleep before each retry (``max_retries - 1`` values)."""
+    delay = initial_delay
+    for attempt in range(max_retries - 1):
+        if jitter:
+            # Decorrelated jitter: spread concurrent callers apart while still
+            # growing roughly by backoff_factor per attempt.
+            delay = random.uniform(initial_delay, delay * backoff_factor)
+        else:
+            delay = initial_delay * (backoff_factor ** attempt)
+        yield delay
+
+
 def retry_with_backoff(
     func=None,
     *,
@@ -223,11 +466,17 @@ def retry_with_backoff(
     backoff_factor: float = 2.0,
     exceptions: tuple[type[Exception], ...] = (Exception,),
     retry_on_result: Optional[Callable[[Any], bool]] = None,
+    jitter: bool = False,
+    non_retryable: tuple[type[Exception], ...] = (
+        TypeError, KeyError, AttributeError, NotImplementedError,
+    ),
 ):
     """
     Decorator for retrying a function with exponential backoff.
 
     Can be used as ``@retry_with_backoff(...)`` or ``retry_with_backoff(fn, ...)``.
+    Coroutine functions are supported: the wrapper is itself a coroutine
+    function and waits with ``asyncio.sleep`` so other tasks keep running.
     For complex scenarios consider using :class:`LLMClient`, which integrates
     configurable retry logic.
 
@@ -241,13 +490,27 @@ def retry_with_backoff(
             function result should trigger a retry even if no exception was
             raised. Defaults to flagging string responses that contain the
             word "error" (case-insensitive).
+        jitter: If True, draw each delay from
+            ``uniform(initial_delay, previous_delay * backoff_factor)``
+            ("decorrelated jitter") so concurrent callers do not retry in
+            lockstep (default: False).
+        non_retryable: Exception classes that signal a deterministic bug
+            rather than a transient failure; they are re-raised immediately
+            without sleeping, even when covered by ``exceptions``. Classes
+            listed explicitly in ``exceptions`` are still retried. Pass ``()``
+            to retry everything matched by ``exceptions``.
 
     Returns:
         Wrapped function with retry logic or the decorator itself.
+
+    Examples:
+        >>> @retry_with_backoff(max_retries=5, jitter=True)
+        ... async def fetch():
+        ...     ...
     """
 
-    import functools
-    import time
+    # Listing a class in ``exceptions`` opts it back into retries.
+    fail_fast = tuple(cls for cls in non_retryable if cls not in exceptions)
 
     def decorator(target_func):
         result_checker = retry_on_result
@@ -258,37 +521,73 @@ def retry_with_backoff(
 
             result_checker = _default_checker
 
+        def check_result(result: Any) -> Any:
+            if result_checker and result_checker(result):
+                raise _RetryResultTrigger("Result triggered retry_with_backoff")
+            return result
+
+        def log_retry(attempt: int, exc: Exception, delay: float) -> None:
+            logging.warning(
+                f"Attempt {attempt + 1}/{max_retries} failed: {exc}. "
+                f"Retrying in {delay:.2f}s..."
+            )
+
+        def give_up(last_exception: Optional[Exception]):
+            logging.error(f"All {max_retries} retry attempts failed")
+            if last_exception:
+                raise last_exception
+            raise RuntimeError(f"Failed after {max_retries} attempts")
+
+        if inspect.iscoroutinefunction(target_func):
+            @functools.wraps(target_func)
+            async def async_wrapper(*args, **kwargs):
+                last_exception = None
+                delays = _retry_delays(max_retries, initial_delay, backoff_factor, jitter)
+
+                for attempt in range(max_retries):
+                    try:
+                        return check_result(await target_func(*args, **kwargs))
+                    except (KeyboardInterrupt, SystemExit):
+                        raise
+                    except exceptions as exc:
+                        if fail_fast and isinstance(exc, fail_fast):
+                            raise
+                        last_exception = exc
+                    except _RetryResultTrigger as exc:
+                        last_exception = exc
+
+                    delay = next(delays, None)
+                    if delay is not None:
+                        log_retry(attempt, last_exception, delay)
+                        await asyncio.sleep(delay)
+
+                give_up(last_exception)
+
+            return async_wrapper
+
         @functools.wraps(target_func)
         def wrapper(*args, **kwargs):
             last_exception = None
+            delays = _retry_delays(max_retries, initial_delay, backoff_factor, jitter)
 
             for attempt in range(max_retries):
                 try:
-                    result = target_func(*args, **kwargs)
-                    if result_checker and result_checker(result):
-                        raise _RetryResultTrigger("Result triggered retry_with_backoff")
-                    return result
-                except exceptions as exc:  # type: ignore[misc]
+                    return check_result(target_func(*args, **kwargs))
+                except (KeyboardInterrupt, SystemExit):
+                    raise
+                except exceptions as exc:
+                    if fail_fast and isinstance(exc, fail_fast):
+                        raise
                     last_exception = exc
                 except _RetryResultTrigger as exc:
                     last_exception = exc
 
-                if last_exception is None:
-                    continue
-
-                if attempt < max_retries - 1:
-                    delay = initial_delay * (backoff_factor ** attempt)
-                    logging.warning(
-                        f"Attempt {attempt + 1}/{max_retries} failed: {last_exception}. "
-                        f"Retrying in {delay:.2f}s..."
-                    )
+                delay = next(delays, None)
+                if delay is not None:
+                    log_retry(attempt, last_exception, delay)
                     time.sleep(delay)
-                else:
-                    logging.error(f"All {max_retries} retry attempts failed")
 
-            if last_exception:
-                raise last_exception
-            raise RuntimeError(f"Failed after {max_retries} attempts")
+            give_up(last_exception)
 
         return wrapper
 
@@ -303,6 +602,7 @@ def retry_with_backoff(
 
 __all__ = [
     "safe_extract_json",
+    "safe_extract_json_batch",
     "configure_logging",
     "retry_with_backoff",
 ]
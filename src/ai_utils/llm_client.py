@@ -2,18 +2,94 @@
 LLM client wrapper for OpenAI-compatible APIs with retry logic.
 """
 
+import asyncio
+import functools
+import hashlib
+import json
 import logging
+import math
 import os
+import random
+import tempfile
+import threading
 import time
-from typing import Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar, Union
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
 except ImportError:
     requests = None  # type: ignore
+    HTTPAdapter = None  # type: ignore
+
+# orjson serializes request bodies and parses responses several times faster
+# than the stdlib, and both directions work on bytes without a str round-trip.
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+if orjson is not None:
+    # Int keys (e.g. logit_bias token ids) are stringified like json.dumps does.
+    _orjson_dumps = functools.partial(orjson.dumps, option=orjson.OPT_NON_STR_KEYS)
+
+    def _dumps_body(payload: Any) -> bytes:
+        try:
+            return _orjson_dumps(payload)
+        except TypeError:
+            # orjson rejects some values the stdlib accepts (e.g. ints wider
+            # than 64 bits); send those bodies exactly as requests would.
+            return json.dumps(payload).encode("utf-8")
+
+    _loads_body = orjson.loads
+else:
+    def _dumps_body(payload: Any) -> bytes:
+        return json.dumps(payload).encode("utf-8")
+
+    _loads_body = json.loads
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+# Smoothing factor for the per-client moving average of retries per call.
+_RETRY_EWMA_ALPHA = 0.2
+
+# Connections kept open to the API host; sized above generate_batch's default
+# concurrency so a batch never has to open and discard extra connections.
+_POOL_MAXSIZE = 32
+
+
+def _retry_after_seconds(response: Any) -> Optional[float]:
+    """Return the wait requested by a ``Retry-After`` header, if any.
+
+    The header may hold a number of seconds or an HTTP date.
+    """
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not isinstance(value, str) or not value.strip():
+        return None
+
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(0.0, seconds) if math.isfinite(seconds) else None
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
 
 class LLMClient:
     """
@@ -34,6 +110,19 @@ class LLMClient:
         api_key: Optional override for LLM_API_KEY environment variable
         max_retries: Maximum number of retry attempts (default: 3)
         initial_retry_delay: Initial delay in seconds for exponential backoff (default: 1.0)
+        cache_dir: Optional directory for an on-disk response cache. Identical
+            requests (same base URL, model, prompt and parameters) are answered
+            from the cache instead of the API (default: None, no caching)
+        cache_size: Number of responses to keep in an in-memory LRU cache in
+            front of the API (and of ``cache_dir``). A repeated identical
+            request returns the stored text without a network call
+            (default: 0, disabled)
+        adaptive_backoff: If True, scale backoff delays by the recent average
+            number of retries per call (clamped to 0.25x-4x): short waits while
+            the API is healthy, longer ones while it keeps failing (default: False)
+        max_retry_after: Longest wait in seconds honored from a server's
+            ``Retry-After`` header; larger hints are clamped to it
+            (default: 60.0)
 
     Examples:
         >>> # Using environment variables
@@ -57,6 +146,10 @@ class LLMClient:
         ...     max_tokens=500,
         ...     temperature=0.7
         ... )
+
+        >>> # Release pooled connections when done
+        >>> with LLMClient() as client:
+        ...     client.generate("Hello!")
     """
 
     def __init__(
@@ -66,6 +159,10 @@ class LLMClient:
         api_key: Optional[str] = None,
         max_retries: int = 3,
         initial_retry_delay: float = 1.0,
+        cache_dir: Optional[Union[str, os.PathLike]] = None,
+        adaptive_backoff: bool = False,
+        cache_size: int = 0,
+        max_retry_after: float = 60.0,
     ):
         """Initialize the LLM client with configuration."""
         if requests is None:
@@ -79,6 +176,22 @@ class LLMClient:
         self.api_key = api_key or os.environ.get("LLM_API_KEY")
         self.max_retries = max_retries
         self.initial_retry_delay = initial_retry_delay
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir is not None else None
+        self.adaptive_backoff = adaptive_backoff
+        self.cache_size = cache_size
+        self.max_retry_after = max_retry_after
+
+        # In-memory LRU of responses keyed by the exact request body, shared
+        # by generate_batch worker threads.
+        self._memory_cache: OrderedDict[bytes, str] = OrderedDict()
+        self._memory_cache_lock = threading.Lock()
+
+        # Call statistics, shared by generate_batch worker threads.
+        self._stats_lock = threading.Lock()
+        self._calls = 0
+        self._retries = 0
+        self._failures = 0
+        self._ewma_retries = 0.0
 
         if not self.base_url:
             raise ValueError(
@@ -92,6 +205,26 @@ class LLMClient:
             raise ValueError(
                 "api_key must be provided or LLM_API_KEY environment variable must be set"
             )
+        if cache_size < 0:
+            raise ValueError("cache_size must be non-negative")
+        if max_retry_after < 0:
+            raise ValueError("max_retry_after must be non-negative")
+
+        # The endpoint is fixed for the client's lifetime, like the session
+        # below, so build it once rather than on every request.
+        self._endpoint = f"{self.base_url.rstrip('/')}/chat/completions"
+
+        # One session per client: connections (and their TLS handshakes) are
+        # reused across generate() calls instead of being rebuilt per request.
+        self._session = requests.Session()
+        self._session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        })
+        self._session.mount(
+            self.base_url,
+            HTTPAdapter(pool_connections=1, pool_maxsize=_POOL_MAXSIZE, max_retries=0),
+        )
 
         logger.info(f"Initialized LLMClient with base_url={self.base_url}, model={self.model}")
 
@@ -126,84 +259,427 @@ class LLMClient:
             ...     max_tokens=100
             ... )
         """
+        url, body = self._prepare_request(prompt, kwargs)
+
+        # The body already encodes the model, prompt and parameters, so it is
+        # an exact key for the in-memory cache without serializing again.
+        if self.cache_size:
+            cached = self._memory_cache_get(body)
+            if cached is not None:
+                logger.debug(f"Memory cache hit for request to {url}")
+                return cached
+
+        cache_path = self._cache_path(prompt, kwargs) if self.cache_dir is not None else None
+        if cache_path is not None:
+            cached = self._read_cache(cache_path)
+            if cached is not None:
+                logger.debug(f"Cache hit for request to {url}")
+                if self.cache_size:
+                    self._memory_cache_put(body, cached)
+                return cached
+
+        def send() -> str:
+            response = self._session.post(url, data=body, timeout=60)
+            response.raise_for_status()
+
+            # Parse the raw body: skips requests' charset detection and the
+            # bytes -> str decode that response.json() performs first.
+            data = _loads_body(response.content)
+
+            # Extract the generated text
+            if "choices" in data and len(data["choices"]) > 0:
+                message = data["choices"][0].get("message", {})
+                content = message.get("content", "")
+                if content:
+                    logger.info(f"Successfully generated response ({len(content)} chars)")
+                    return content
+                else:
+                    raise ValueError("API returned empty content")
+            else:
+                raise ValueError(f"Unexpected API response format: {data}")
+
+        content = self._with_retries(url, send)
+        if self.cache_size:
+            self._memory_cache_put(body, content)
+        if cache_path is not None:
+            self._write_cache(cache_path, content)
+        return content
+
+    def generate_stream(self, prompt: str, **kwargs: Any) -> Iterator[str]:
+        """
+        Stream generated text from the LLM as it is produced.
+
+        Sends the request with ``"stream": true`` and yields each content delta
+        from the server-sent events, so callers can start consuming output
+        before the generation finishes. Connecting and receiving the response
+        headers are retried like :meth:`generate`; once text has been yielded,
+        errors are raised as-is since a partial stream cannot be replayed.
+        Streamed responses bypass the response cache.
+
+        Args:
+            prompt: The input prompt/question for the LLM
+            **kwargs: Additional parameters to pass to the API
+
+        Yields:
+            Text deltas in the order they arrive
+
+        Raises:
+            requests.exceptions.RequestException: If all retry attempts fail
+
+        Examples:
+            >>> client = LLMClient()
+            >>> for piece in client.generate_stream("Tell me a story"):
+            ...     print(piece, end="", flush=True)
+        """
+        url, body = self._prepare_request(prompt, {**kwargs, "stream": True})
+
+        def send():
+            response = self._session.post(url, data=body, timeout=60, stream=True)
+            try:
+                response.raise_for_status()
+            except Exception:
+                response.close()
+                raise
+            return response
+
+        return self._iter_stream(self._with_retries(url, send))
+
+    @staticmethod
+    def _iter_stream(response: Any) -> Iterator[str]:
+        try:
+            for line in response.iter_lines():
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                choices = _loads_body(data).get("choices") or ()
+                for choice in choices:
+                    content = (choice.get("delta") or {}).get("content")
+                    if content:
+                        yield content
+        finally:
+            response.close()
+
+    def _prepare_request(self, prompt: str, params: dict) -> tuple[str, bytes]:
+        """Validate ``prompt`` and return the request URL and encoded body."""
         if not isinstance(prompt, str):
             raise TypeError(f"prompt must be a string, got {type(prompt).__name__}")
 
-        if not prompt.strip():
+        # isspace() checks in place; strip() would copy the whole prompt.
+        if not prompt or prompt.isspace():
             raise ValueError("prompt cannot be empty")
 
-        # Prepare the request payload
+        # Prepare the request payload; it is serialized once and the same
+        # bytes are resent on retries. Content-Type is preset on the session.
         payload = {
             "model": self.model,
             "messages": [{"role": "user", "content": prompt}],
-            **kwargs,
+            **params,
         }
+        return self._endpoint, _dumps_body(payload)
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
+    def _with_retries(self, url: str, send: Callable[[], _T]) -> _T:
+        """Call ``send`` with this client's retry and backoff policy."""
+        last_exception = None
+        attempts = 0
+        succeeded = False
+        backoff_scale = self._backoff_scale()
+        # Loop invariants, read once instead of per attempt.
+        max_retries = self.max_retries
+        base_delay = self.initial_retry_delay * backoff_scale
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        try:
+            for attempt in range(max_retries):
+                attempts += 1
+                retry_after = None
+                try:
+                    if debug_enabled:
+                        logger.debug(f"Attempt {attempt + 1}/{max_retries}: Sending request to {url}")
+                    result = send()
+                    succeeded = True
+                    return result
+
+                except requests.exceptions.Timeout as e:
+                    last_exception = e
+                    logger.warning(f"Attempt {attempt + 1}/{max_retries} timed out: {e}")
+
+                except requests.exceptions.HTTPError as e:
+                    last_exception = e
+                    # Compare against None: a Response is falsy for any 4xx/5xx.
+                    response = e.response
+                    status_code = response.status_code if response is not None else None
+                    logger.error(
+                        f"Attempt {attempt + 1}/{max_retries} failed with HTTP "
+                        f"{status_code if status_code is not None else 'unknown'}: {e}"
+                    )
+
+                    # Don't retry on 4xx errors (except 429 rate limit)
+                    if status_code is not None and 400 <= status_code < 500 and status_code != 429:
+                        logger.error("Client error detected, not retrying")
+                        raise
+
+                    retry_after = _retry_after_seconds(response)
+
+                except requests.exceptions.RequestException as e:
+                    last_exception = e
+                    logger.error(f"Attempt {attempt + 1}/{max_retries} failed with request error: {e}")
+
+                except (ValueError, KeyError) as e:
+                    last_exception = e
+                    logger.error(f"Attempt {attempt + 1}/{max_retries} failed with parsing error: {e}")
+
+                # Calculate exponential backoff delay
+                if attempt < max_retries - 1:
+                    if retry_after is not None:
+                        # Honor the server's hint, stretched slightly so clients
+                        # throttled together do not all come back at once, but
+                        # never sleep longer than max_retry_after.
+                        delay = min(retry_after * random.uniform(1.0, 1.2), self.max_retry_after)
+                    else:
+                        delay = base_delay * (2**attempt)
+                    logger.info(f"Retrying in {delay:.2f} seconds...")
+                    time.sleep(delay)
+
+            # All retries exhausted
+            error_msg = f"All {max_retries} retry attempts failed"
+            logger.error(error_msg)
+            if last_exception:
+                raise last_exception
+            else:
+                raise RuntimeError(error_msg)
+        finally:
+            self._record_call(attempts, succeeded)
+
+    def generate_batch(
+        self,
+        prompts: Iterable[str],
+        max_concurrency: int = 10,
+        return_exceptions: bool = False,
+        **kwargs: Any,
+    ) -> list[Union[str, Exception]]:
+        """
+        Generate responses for many prompts with concurrent requests.
 
-        url = f"{self.base_url.rstrip('/')}/chat/completions"
+        Each prompt goes through :meth:`generate` (including its retry logic)
+        on a pool of up to ``max_concurrency`` threads, so network latency of
+        independent requests overlaps instead of adding up.
 
-        # Retry loop with exponential backoff
-        last_exception = None
-        for attempt in range(self.max_retries):
+        Args:
+            prompts: Prompts to send
+            max_concurrency: Maximum number of requests in flight (default: 10)
+            return_exceptions: If True, a failed prompt yields its exception in
+                the result list instead of raising (default: False)
+            **kwargs: Additional parameters passed to every request
+
+        Returns:
+            Responses in the same order as ``prompts``
+
+        Raises:
+            ValueError: If max_concurrency is less than 1
+            Exception: The first failure in prompt order, unless
+                return_exceptions is True
+
+        Examples:
+            >>> client = LLMClient()
+            >>> client.generate_batch(["Translate 'cat' to French", "2 + 2 ="], temperature=0)
+            ['chat', '4']
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        prompts = list(prompts)
+        if not prompts:
+            return []
+
+        def run(prompt: str) -> Union[str, Exception]:
+            if not return_exceptions:
+                return self.generate(prompt, **kwargs)
             try:
-                logger.debug(f"Attempt {attempt + 1}/{self.max_retries}: Sending request to {url}")
+                return self.generate(prompt, **kwargs)
+            except Exception as e:
+                return e
 
-                response = requests.post(url, json=payload, headers=headers, timeout=60)
-                response.raise_for_status()
+        workers = min(max_concurrency, len(prompts))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(run, prompts))
 
-                data = response.json()
+    async def agenerate(self, prompt: str, **kwargs: Any) -> str:
+        """
+        Async variant of :meth:`generate` for use inside an event loop.
 
-                # Extract the generated text
-                if "choices" in data and len(data["choices"]) > 0:
-                    message = data["choices"][0].get("message", {})
-                    content = message.get("content", "")
-                    if content:
-                        logger.info(f"Successfully generated response ({len(content)} chars)")
-                        return content
-                    else:
-                        raise ValueError("API returned empty content")
-                else:
-                    raise ValueError(f"Unexpected API response format: {data}")
-
-            except requests.exceptions.Timeout as e:
-                last_exception = e
-                logger.warning(f"Attempt {attempt + 1}/{self.max_retries} timed out: {e}")
-
-            except requests.exceptions.HTTPError as e:
-                last_exception = e
-                status_code = e.response.status_code if e.response else "unknown"
-                logger.error(f"Attempt {attempt + 1}/{self.max_retries} failed with HTTP {status_code}: {e}")
-
-                # Don't retry on 4xx errors (except 429 rate limit)
-                if e.response and 400 <= e.response.status_code < 500 and e.response.status_code != 429:
-                    logger.error("Client error detected, not retrying")
-                    raise
-
-            except requests.exceptions.RequestException as e:
-                last_exception = e
-                logger.error(f"Attempt {attempt + 1}/{self.max_retries} failed with request error: {e}")
-
-            except (ValueError, KeyError) as e:
-                last_exception = e
-                logger.error(f"Attempt {attempt + 1}/{self.max_retries} failed with parsing error: {e}")
-
-            # Calculate exponential backoff delay
-            if attempt < self.max_retries - 1:
-                delay = self.initial_retry_delay * (2**attempt)
-                logger.info(f"Retrying in {delay:.2f} seconds...")
-                time.sleep(delay)
-
-        # All retries exhausted
-        error_msg = f"All {self.max_retries} retry attempts failed"
-        logger.error(error_msg)
-        if last_exception:
-            raise last_exception
-        else:
-            raise RuntimeError(error_msg)
+        The blocking request runs in the loop's default executor, so several
+        ``agenerate`` calls can be awaited together with ``asyncio.gather``.
+
+        Examples:
+            >>> async def main():
+            ...     client = LLMClient()
+            ...     return await asyncio.gather(
+            ...         client.agenerate("Hello"), client.agenerate("Bonjour")
+            ...     )
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.generate, prompt, **kwargs)
+        )
+
+    async def agenerate_batch(
+        self,
+        prompts: Iterable[str],
+        max_concurrency: int = 10,
+        return_exceptions: bool = False,
+        **kwargs: Any,
+    ) -> list[Union[str, BaseException]]:
+        """
+        Async variant of :meth:`generate_batch` for use inside an event loop.
+
+        At most ``max_concurrency`` :meth:`agenerate` calls are in flight at
+        once, so a large batch does not flood the API or the loop's executor.
+
+        Args:
+            prompts: Prompts to send
+            max_concurrency: Maximum number of requests in flight (default: 10)
+            return_exceptions: If True, a failed prompt yields its exception in
+                the result list instead of raising (default: False)
+            **kwargs: Additional parameters passed to every request
+
+        Returns:
+            Responses in the same order as ``prompts``
+
+        Raises:
+            ValueError: If max_concurrency is less than 1
+            Exception: The first failure to complete, unless return_exceptions
+                is True
+
+        Examples:
+            >>> async def main():
+            ...     client = LLMClient()
+            ...     return await client.agenerate_batch(["Hello", "Bonjour"], max_concurrency=2)
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        prompts = list(prompts)
+        if not prompts:
+            return []
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(prompt: str) -> str:
+            async with semaphore:
+                return await self.agenerate(prompt, **kwargs)
+
+        return await asyncio.gather(
+            *(run(prompt) for prompt in prompts), return_exceptions=return_exceptions
+        )
+
+    def stats(self) -> dict[str, float]:
+        """
+        Return request statistics for this client.
+
+        Returns:
+            Dictionary with ``calls`` (API calls made, cache hits excluded),
+            ``retries`` (extra attempts across those calls), ``failures``
+            (calls that raised), ``ewma_retries`` (moving average of retries
+            per call) and ``backoff_scale`` (multiplier applied to backoff
+            delays; always 1.0 unless ``adaptive_backoff`` is enabled)
+
+        Examples:
+            >>> client = LLMClient()
+            >>> client.generate("Hello!")
+            >>> client.stats()["calls"]
+            1
+        """
+        with self._stats_lock:
+            return {
+                "calls": self._calls,
+                "retries": self._retries,
+                "failures": self._failures,
+                "ewma_retries": self._ewma_retries,
+                "backoff_scale": self._backoff_scale(),
+            }
+
+    def _backoff_scale(self) -> float:
+        if not self.adaptive_backoff:
+            return 1.0
+        return min(4.0, max(0.25, self._ewma_retries))
+
+    def _record_call(self, attempts: int, succeeded: bool) -> None:
+        retries = max(0, attempts - 1)
+        with self._stats_lock:
+            self._calls += 1
+            self._retries += retries
+            if not succeeded:
+                self._failures += 1
+            self._ewma_retries += _RETRY_EWMA_ALPHA * (retries - self._ewma_retries)
+
+    def _memory_cache_get(self, key: bytes) -> Optional[str]:
+        with self._memory_cache_lock:
+            content = self._memory_cache.get(key)
+            if content is not None:
+                self._memory_cache.move_to_end(key)
+            return content
+
+    def _memory_cache_put(self, key: bytes, content: str) -> None:
+        with self._memory_cache_lock:
+            self._memory_cache[key] = content
+            self._memory_cache.move_to_end(key)
+            while len(self._memory_cache) > self.cache_size:
+                self._memory_cache.popitem(last=False)
+
+    def _cache_path(self, prompt: str, params: dict) -> Path:
+        """Return the cache file for a request, keyed by a hash of its inputs."""
+        # __init__ rejects a missing base URL or model; callers check cache_dir.
+        assert self.base_url is not None and self.model is not None
+        assert self.cache_dir is not None
+        digest = hashlib.sha256()
+        # Length-prefix every field so ("ab", "c") and ("a", "bc") never collide.
+        for part in (self.base_url, self.model, prompt, json.dumps(params, sort_keys=True)):
+            encoded = part.encode("utf-8")
+            digest.update(len(encoded).to_bytes(8, "big"))
+            digest.update(encoded)
+        key = digest.hexdigest()
+        return self.cache_dir / key[:2] / f"{key[2:]}.json"
+
+    @staticmethod
+    def _read_cache(path: Path) -> Optional[str]:
+        try:
+            with path.open(encoding="utf-8") as fh:
+                content = json.load(fh)["content"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return content if isinstance(content, str) and content else None
+
+    @staticmethod
+    def _write_cache(path: Path, content: str) -> None:
+        # Write to a temp file and rename so concurrent readers never see a
+        # partial entry; a failed write only costs a future cache miss.
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        except OSError as e:
+            logger.warning(f"Could not write response cache entry {path}: {e}")
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump({"content": content}, fh)
+            os.replace(tmp_name, path)
+        except OSError as e:
+            logger.warning(f"Could not write response cache entry {path}: {e}")
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        """Close pooled HTTP connections held by the client."""
+        self._session.close()
+
+    def __enter__(self) -> "LLMClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     def __repr__(self) -> str:
         """Return a string representation of the client."""
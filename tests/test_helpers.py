@@ -3,7 +3,13 @@
 import json
 import logging
 import pytest
-from ai_utils.helpers import safe_extract_json, configure_logging, retry_with_backoff
+from ai_utils import helpers
+from ai_utils.helpers import (
+    safe_extract_json,
+    safe_extract_json_batch,
+    configure_logging,
+    retry_with_backoff,
+)
 
 
 class TestSafeExtractJson:
@@ -149,6 +155,139 @@ class TestSafeExtractJson:
         result = safe_extract_json(text)
         assert result == {"text": "Line 1\nLine 2\tTabbed"}
 
+    def test_deeply_nested_json_with_text(self):
+        """Test nesting deeper than two levels is extracted whole."""
+        text = 'Result: {"a": {"b": {"c": [1, {"d": 2}]}}} done'
+        assert safe_extract_json(text) == {"a": {"b": {"c": [1, {"d": 2}]}}}
+
+    def test_multiple_values_in_document_order(self):
+        """Test allow_multiple returns top-level values in order without fragments."""
+        text = 'A: [1, 2] B: {"x": {"y": 1}} C: not {json} D: [3]'
+        result = safe_extract_json(text, allow_multiple=True)
+        assert result == [[1, 2], {"x": {"y": 1}}, [3]]
+
+    def test_object_preferred_over_earlier_array(self):
+        """Test a bracketed citation before the object does not win."""
+        assert safe_extract_json('see [1] and {"a": 1}') == {"a": 1}
+        assert safe_extract_json('see [1] and [2]') == [1]
+
+    def test_braces_inside_strings(self):
+        """Test braces inside string values do not confuse extraction."""
+        text = 'Output: {"template": "Hello {name}]"} end'
+        assert safe_extract_json(text) == {"template": "Hello {name}]"}
+
+    def test_bytes_input(self):
+        """Test raw UTF-8 bytes are parsed directly or decoded for the scans."""
+        assert safe_extract_json(b' {"a": [1, 2]} ') == {"a": [1, 2]}
+        assert safe_extract_json('Résultat: {"ok": true}'.encode()) == {"ok": True}
+        assert safe_extract_json(bytearray(b'[1]')) == [1]
+        assert safe_extract_json(b'   ', default="empty") == "empty"
+        assert safe_extract_json(b'\xff\xfe not json', default={}) == {}
+
+    def test_bare_json_scalars(self):
+        """Test direct parsing of top-level scalars, bare or in inline code."""
+        assert safe_extract_json('42') == 42
+        assert safe_extract_json(' "text" ') == "text"
+        assert safe_extract_json('null', default="unset") is None
+        assert safe_extract_json('The answer is `42`') == 42
+        assert safe_extract_json('no delimiters at all', default="unset") == "unset"
+
+    def test_lenient_trailing_commas(self):
+        """Test lenient mode recovers trailing commas."""
+        text = 'Here you go: {"tags": ["a", "b",], "count": 2,} Thanks!'
+        assert safe_extract_json(text, default={}) == {}
+        assert safe_extract_json(text, lenient=True) == {"tags": ["a", "b"], "count": 2}
+        assert safe_extract_json(text, lenient=True, allow_multiple=True) == [
+            {"tags": ["a", "b"], "count": 2}
+        ]
+
+    def test_lenient_without_json5(self, monkeypatch):
+        """Test lenient mode falls back to default when only json5 could parse."""
+        monkeypatch.setattr(helpers, "json5", None)
+        assert safe_extract_json("{'a': 1}", default="none", lenient=True) == "none"
+
+    def test_lenient_with_json5(self):
+        """Test lenient mode uses json5 for single quotes and unquoted keys."""
+        pytest.importorskip("json5")
+        text = "Result: {name: 'Ada', 'langs': ['en',]}"
+        assert safe_extract_json(text, lenient=True) == {"name": "Ada", "langs": ["en"]}
+
+    def test_matches_stdlib_semantics(self):
+        """Test results do not depend on whether orjson is installed."""
+        import math
+
+        assert math.isnan(safe_extract_json("NaN"))
+        assert safe_extract_json("Infinity") == float("inf")
+        assert safe_extract_json(b"-Infinity") == float("-inf")
+        big = 123456789012345678901234567890
+        assert safe_extract_json(f'{{"id": {big}}}') == {"id": big}
+        assert safe_extract_json(b'[-9223372036854775809]') == [-9223372036854775809]
+        assert safe_extract_json(f'```json\n{{"id": {big}}}\n```') == {"id": big}
+
+        result = safe_extract_json('{"a": NaN}', allow_multiple=True)
+        assert isinstance(result, dict) and math.isnan(result["a"])
+
+    def test_stdlib_json_fallback(self, monkeypatch):
+        """Test extraction when orjson is not available."""
+        monkeypatch.setattr(helpers, "_json_loads", json.loads)
+        text = 'Result: {"ok": true, "items": [1, 2]} done'
+        assert safe_extract_json(text) == {"ok": True, "items": [1, 2]}
+        assert safe_extract_json("no json here", default={}) == {}
+
+    def test_cache_reuses_results(self):
+        """Test cache=True parses a repeated text once and shares the result."""
+        safe_extract_json.cache_clear()
+        text = 'Result: {"items": [1, 2]}'
+        first = safe_extract_json(text, cache=True)
+        assert safe_extract_json(text, cache=True) is first
+        assert safe_extract_json.cache_info().hits == 1
+
+        copied = safe_extract_json(text, cache=True, copy_result=True)
+        copied["items"].append(3)
+        assert first == {"items": [1, 2]}
+
+        assert safe_extract_json("no json", default=[], cache=True) == []
+        safe_extract_json.cache_clear()
+
+    def test_cache_skips_large_texts(self, monkeypatch):
+        """Test texts over JSON_CACHE_MAX_CHARS bypass the cache."""
+        safe_extract_json.cache_clear()
+        monkeypatch.setattr(helpers, "JSON_CACHE_MAX_CHARS", 8)
+        assert safe_extract_json('Result: {"a": 1}', cache=True) == {"a": 1}
+        assert safe_extract_json.cache_info().currsize == 0
+
+
+class TestSafeExtractJsonBatch:
+    """Tests for safe_extract_json_batch function."""
+
+    def test_matches_single_calls(self):
+        """Test batch results equal per-item safe_extract_json calls."""
+        texts = [
+            '{"a": 1}',
+            'Here: [1, 2] and {"b": 2}',
+            '```json\n{"c": 3}\n```',
+            b'{"d": 4}',
+            'no json',
+        ]
+        assert safe_extract_json_batch(texts, default={}) == [
+            safe_extract_json(text, default={}) for text in texts
+        ]
+        assert safe_extract_json_batch(texts, allow_multiple=True) == [
+            safe_extract_json(text, allow_multiple=True) for text in texts
+        ]
+
+    def test_lenient_option(self):
+        """Test options are applied to every item."""
+        assert safe_extract_json_batch(['{"a": 1,}'], lenient=True) == [{"a": 1}]
+
+    def test_empty_and_type_errors(self):
+        """Test empty input and type validation."""
+        assert safe_extract_json_batch([]) == []
+        with pytest.raises(TypeError):
+            safe_extract_json_batch('{"a": 1}')  # type: ignore
+        with pytest.raises(TypeError):
+            safe_extract_json_batch(['{}', 1])  # type: ignore
+
 
 class TestConfigureLogging:
     """Tests for configure_logging function."""
@@ -204,6 +343,32 @@ class TestConfigureLogging:
         ai_utils_logger = logging.getLogger('ai_utils')
         assert ai_utils_logger.level == logging.DEBUG
 
+    def test_repeated_call_keeps_handler(self):
+        """Test identical repeated calls do not rebuild the root handler."""
+        import io
+        stream = io.StringIO()
+        logger = configure_logging(level='INFO', stream=stream)
+        (handler,) = logger.handlers
+
+        configure_logging(level='INFO', stream=stream)
+        assert logger.handlers == [handler]
+
+        configure_logging(level='DEBUG', stream=stream)
+        assert logger.handlers != [handler]
+        assert logger.level == logging.DEBUG
+
+    def test_reconfigures_after_external_change(self):
+        """Test a handler replaced elsewhere is reinstalled on the next call."""
+        import io
+        stream = io.StringIO()
+        logger = configure_logging(level='INFO', stream=stream, include_timestamp=False)
+        logging.basicConfig(level=logging.WARNING, force=True)
+
+        logger = configure_logging(level='INFO', stream=stream, include_timestamp=False)
+        assert logger.level == logging.INFO
+        logger.info("hello")
+        assert stream.getvalue() == "[INFO] - hello\n"
+
 
 class TestRetryWithBackoff:
     """Tests for retry_with_backoff decorator."""
@@ -333,6 +498,100 @@ class TestRetryWithBackoff:
         result = retried_func(10)
         assert result == 20
 
+    def test_async_function(self):
+        """Test coroutine functions are retried with a coroutine wrapper."""
+        import asyncio
+        import inspect
+        call_count = [0]
+
+        @retry_with_backoff(max_retries=3, initial_delay=0.01)
+        async def flaky_async():
+            call_count[0] += 1
+            if call_count[0] < 3:
+                raise ValueError("Temporary error")
+            return "success"
+
+        assert inspect.iscoroutinefunction(flaky_async)
+        assert asyncio.run(flaky_async()) == "success"
+        assert call_count[0] == 3
+
+    def test_async_retries_exhausted(self):
+        """Test coroutine wrapper re-raises the last exception."""
+        import asyncio
+
+        @retry_with_backoff(max_retries=2, initial_delay=0.01)
+        async def always_fails():
+            raise ValueError("Always fails")
+
+        with pytest.raises(ValueError, match="Always fails"):
+            asyncio.run(always_fails())
+
+    def test_non_retryable_raises_immediately(self, monkeypatch):
+        """Test deterministic errors are not retried or slept on."""
+        delays = []
+        monkeypatch.setattr("time.sleep", delays.append)
+        call_count = [0]
+
+        @retry_with_backoff(max_retries=5, initial_delay=1.0)
+        def buggy():
+            call_count[0] += 1
+            return {}["missing"]
+
+        with pytest.raises(KeyError):
+            buggy()
+        assert call_count[0] == 1
+        assert delays == []
+
+    def test_non_retryable_overrides(self, monkeypatch):
+        """Test explicit exceptions and an empty non_retryable re-enable retries."""
+        monkeypatch.setattr("time.sleep", lambda delay: None)
+        call_count = [0]
+
+        def fails():
+            call_count[0] += 1
+            raise TypeError("bad")
+
+        with pytest.raises(TypeError):
+            retry_with_backoff(fails, max_retries=3, exceptions=(TypeError,))()
+        assert call_count[0] == 3
+
+        call_count[0] = 0
+        with pytest.raises(TypeError):
+            retry_with_backoff(fails, max_retries=3, non_retryable=())()
+        assert call_count[0] == 3
+
+    def test_async_non_retryable(self):
+        """Test coroutine wrapper also fails fast on non-retryable errors."""
+        import asyncio
+        call_count = [0]
+
+        @retry_with_backoff(max_retries=3, initial_delay=10.0)
+        async def buggy():
+            call_count[0] += 1
+            raise AttributeError("no attribute")
+
+        with pytest.raises(AttributeError):
+            asyncio.run(buggy())
+        assert call_count[0] == 1
+
+    def test_jitter_delays(self, monkeypatch):
+        """Test jittered delays stay between initial_delay and the growth bound."""
+        delays = []
+        monkeypatch.setattr("time.sleep", delays.append)
+
+        @retry_with_backoff(max_retries=6, initial_delay=0.5, backoff_factor=2.0, jitter=True)
+        def always_fails():
+            raise ValueError("Retry")
+
+        with pytest.raises(ValueError):
+            always_fails()
+
+        assert len(delays) == 5
+        previous = 0.5
+        for delay in delays:
+            assert 0.5 <= delay <= previous * 2.0
+            previous = delay
+
 
 class TestHelpersIntegration:
     """Integration tests for helpers working together."""
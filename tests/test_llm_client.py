@@ -1,5 +1,6 @@
 """Tests for LLMClient."""
 
+import json
 import os
 import pytest
 from unittest.mock import Mock, patch, MagicMock
@@ -78,14 +79,14 @@ class TestLLMClient:
         assert client.max_retries == 5
         assert client.initial_retry_delay == 2.0
 
-    @patch('ai_utils.llm_client.requests.post')
+    @patch('ai_utils.llm_client.requests.Session.post')
     def test_successful_generate(self, mock_post):
         """Test successful text generation."""
         # Mock successful API response
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             'choices': [{'message': {'content': 'Generated response'}}]
-        }
+        }).encode()
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
 
@@ -97,17 +98,17 @@ class TestLLMClient:
 
         # Verify request structure
         call_args = mock_post.call_args
-        assert 'json' in call_args.kwargs
-        assert call_args.kwargs['json']['model'] == 'test-model'
-        assert call_args.kwargs['json']['messages'][0]['content'] == "Test prompt"
+        payload = json.loads(call_args.kwargs['data'])
+        assert payload['model'] == 'test-model'
+        assert payload['messages'][0]['content'] == "Test prompt"
 
-    @patch('ai_utils.llm_client.requests.post')
+    @patch('ai_utils.llm_client.requests.Session.post')
     def test_generate_with_kwargs(self, mock_post):
         """Test generation with additional parameters."""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             'choices': [{'message': {'content': 'Response'}}]
-        }
+        }).encode()
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
 
@@ -115,10 +116,29 @@ class TestLLMClient:
         client.generate("Test", temperature=0.7, max_tokens=100)
 
         call_args = mock_post.call_args
-        assert call_args.kwargs['json']['temperature'] == 0.7
-        assert call_args.kwargs['json']['max_tokens'] == 100
+        payload = json.loads(call_args.kwargs['data'])
+        assert payload['temperature'] == 0.7
+        assert payload['max_tokens'] == 100
+
+    @patch('ai_utils.llm_client.requests.Session.post')
+    def test_generate_with_int_keyed_params(self, mock_post):
+        """Test int dict keys and wide ints serialize as with json.dumps."""
+        mock_response = Mock()
+        mock_response.content = json.dumps({
+            'choices': [{'message': {'content': 'Response'}}]
+        }).encode()
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+
+        client = LLMClient()
+        client.generate("Test", logit_bias={50256: -100})
+        payload = json.loads(mock_post.call_args.kwargs['data'])
+        assert payload['logit_bias'] == {'50256': -100}
 
-    @patch('ai_utils.llm_client.requests.post')
+        client.generate("Test", seed=2**70)
+        assert json.loads(mock_post.call_args.kwargs['data'])['seed'] == 2**70
+
+    @patch('ai_utils.llm_client.requests.Session.post')
     def test_empty_prompt_error(self, mock_post):
         """Test that empty prompt raises ValueError."""
         client = LLMClient()
@@ -128,14 +148,14 @@ class TestLLMClient:
         with pytest.raises(ValueError, match="prompt cannot be empty"):
             client.generate("   ")
 
-    @patch('ai_utils.llm_client.requests.post')
+    @patch('ai_utils.llm_client.requests.Session.post')
     def test_non_string_prompt_error(self, mock_post):
         """Test that non-string prompt raises TypeError."""
         client = LLMClient()
         with pytest.raises(TypeError, match="prompt must be a string"):
             client.generate(123)  # type: ignore
 
-    @patch('ai_utils.llm_client.requests.post')
+    @patch('ai_utils.llm_client.requests.Session.post')
     @patch('ai_utils.llm_client.time.sleep')
     def test_retry_on_timeout(self, mock_sleep, mock_post):
         """Test retry logic on timeout."""
@@ -143,9 +163,9 @@ class TestLLMClient:
 
         # First two attempts timeout, third succeeds
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             'choices': [{'message': {'content': 'Success after retry'}}]
-        }
+        }).encode()
         mock_response.raise_for_status = Mock()
 
         mock_post.side_effect = [
@@ -161,7 +181,7 @@ class TestLLMClient:
         assert mock_post.call_count == 3
         assert mock_sleep.call_count == 2  # Two retries with delays
 
-    @patch('ai_utils.llm_client.requests.post')
+    @patch('ai_utils.llm_client.requests.Session.post')
     @patch('ai_utils.llm_client.time.sleep')
     def test_retry_exhaustion(self, mock_sleep, mock_post):
         """Test that all retries are exhausted."""
@@ -176,7 +196,7 @@ class TestLLMClient:
 
         assert mock_post.call_count == 3
 
-    @patch('ai_utils.llm_client.requests.post')
+    @patch('ai_utils.llm_client.requests.Session.post')
     def test_no_retry_on_4xx_error(self, mock_post):
         """Test that 4xx errors (except 429) are not retried."""
         import requests
@@ -196,7 +216,21 @@ class TestLLMClient:
         # Should only be called once, no retries
         assert mock_post.call_count == 1
 
-    @patch('ai_utils.llm_client.requests.post')
+    @patch('ai_utils.llm_client.requests.Session.post')
+    def test_no_retry_on_real_4xx_response(self, mock_post):
+        """Test a real (falsy) requests.Response with a 4xx status is not retried."""
+        import requests
+
+        response = requests.Response()
+        response.status_code = 404
+        mock_post.return_value = response
+
+        client = LLMClient(max_retries=3)
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.generate("Test")
+        assert mock_post.call_count == 1
+
+    @patch('ai_utils.llm_client.requests.Session.post')
     @patch('ai_utils.llm_client.time.sleep')
     def test_retry_on_429_rate_limit(self, mock_sleep, mock_post):
         """Test retry on 429 rate limit error."""
@@ -210,9 +244,9 @@ class TestLLMClient:
         )
 
         mock_response_success = Mock()
-        mock_response_success.json.return_value = {
+        mock_response_success.content = json.dumps({
             'choices': [{'message': {'content': 'Success'}}]
-        }
+        }).encode()
         mock_response_success.raise_for_status = Mock()
 
         mock_post.side_effect = [mock_response_429, mock_response_success]
@@ -223,11 +257,10 @@ class TestLLMClient:
         assert result == "Success"
         assert mock_post.call_count == 2
 
-    @patch('ai_utils.llm_client.requests.post')
+    @patch('ai_utils.llm_client.requests.Session.post')
     def test_exponential_backoff(self, mock_post):
         """Test exponential backoff delay calculation."""
         import requests
-        import time
 
         mock_post.side_effect = requests.exceptions.Timeout("Timeout")
 
@@ -243,11 +276,11 @@ class TestLLMClient:
             assert calls[0] == 1.0  # First retry: 1 * 2^0
             assert calls[1] == 2.0  # Second retry: 1 * 2^1
 
-    @patch('ai_utils.llm_client.requests.post')
+    @patch('ai_utils.llm_client.requests.Session.post')
     def test_unexpected_response_format(self, mock_post):
         """Test handling of unexpected API response format."""
         mock_response = Mock()
-        mock_response.json.return_value = {'unexpected': 'format'}
+        mock_response.content = json.dumps({'unexpected': 'format'}).encode()
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
 
@@ -256,13 +289,13 @@ class TestLLMClient:
         with pytest.raises(ValueError, match="Unexpected API response format"):
             client.generate("Test")
 
-    @patch('ai_utils.llm_client.requests.post')
+    @patch('ai_utils.llm_client.requests.Session.post')
     def test_empty_content_in_response(self, mock_post):
         """Test handling of empty content in API response."""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             'choices': [{'message': {'content': ''}}]
-        }
+        }).encode()
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
 
@@ -279,13 +312,13 @@ class TestLLMClient:
         assert 'https://api.test.com/v1' in repr_str
         assert 'test-model' in repr_str
 
-    @patch('ai_utils.llm_client.requests.post')
+    @patch('ai_utils.llm_client.requests.Session.post')
     def test_url_construction(self, mock_post):
         """Test that URL is constructed correctly."""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             'choices': [{'message': {'content': 'Test'}}]
-        }
+        }).encode()
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
 
@@ -306,20 +339,424 @@ class TestLLMClient:
         url = call_args.args[0]
         assert url == 'https://api.test.com/v1/chat/completions'
 
-    @patch('ai_utils.llm_client.requests.post')
+    @patch('ai_utils.llm_client.requests.Session.post')
     def test_authorization_header(self, mock_post):
         """Test that authorization header is set correctly."""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             'choices': [{'message': {'content': 'Test'}}]
-        }
+        }).encode()
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
 
         client = LLMClient()
         client.generate("Test")
 
-        call_args = mock_post.call_args
-        headers = call_args.kwargs['headers']
+        # Headers are set once on the pooled session, not per request
+        headers = client._session.headers
         assert headers['Authorization'] == 'Bearer test-key'
         assert headers['Content-Type'] == 'application/json'
+
+    @patch('ai_utils.llm_client.requests.Session.post')
+    def test_generate_batch_preserves_order(self, mock_post):
+        """Test batch generation returns responses in prompt order."""
+        def respond(url, data, **kwargs):
+            content = json.loads(data)['messages'][0]['content'].upper()
+            response = Mock()
+            response.content = json.dumps({'choices': [{'message': {'content': content}}]}).encode()
+            response.raise_for_status = Mock()
+            return response
+
+        mock_post.side_effect = respond
+
+        client = LLMClient()
+        prompts = [f"prompt {i}" for i in range(20)]
+        results = client.generate_batch(prompts, max_concurrency=4, temperature=0)
+
+        assert results == [p.upper() for p in prompts]
+        assert mock_post.call_count == 20
+        assert all(
+            json.loads(call.kwargs['data'])['temperature'] == 0 for call in mock_post.call_args_list
+        )
+
+    @patch('ai_utils.llm_client.requests.Session.post')
+    def test_generate_batch_return_exceptions(self, mock_post):
+        """Test batch generation can collect failures instead of raising."""
+        import requests
+
+        ok = Mock()
+        ok.content = json.dumps({'choices': [{'message': {'content': 'ok'}}]}).encode()
+        ok.raise_for_status = Mock()
+
+        bad = Mock()
+        bad.status_code = 400
+        bad.raise_for_status.side_effect = requests.exceptions.HTTPError(response=bad)
+
+        mock_post.side_effect = lambda url, data, **kwargs: (
+            bad if json.loads(data)['messages'][0]['content'] == 'bad' else ok
+        )
+
+        client = LLMClient()
+        results = client.generate_batch(["good", "bad"], max_concurrency=1, return_exceptions=True)
+        assert results[0] == 'ok'
+        assert isinstance(results[1], requests.exceptions.HTTPError)
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.generate_batch(["good", "bad"], max_concurrency=1)
+
+    def test_generate_batch_validation(self):
+        """Test batch generation argument handling."""
+        client = LLMClient()
+        assert client.generate_batch([]) == []
+        with pytest.raises(ValueError, match="max_concurrency"):
+            client.generate_batch(["Test"], max_concurrency=0)
+
+    @patch('ai_utils.llm_client.requests.Session.post')
+    def test_agenerate(self, mock_post):
+        """Test async generation can be gathered."""
+        import asyncio
+
+        mock_response = Mock()
+        mock_response.content = json.dumps({'choices': [{'message': {'content': 'Async'}}]}).encode()
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+
+        client = LLMClient()
+
+        async def run():
+            return await asyncio.gather(client.agenerate("a"), client.agenerate("b"))
+
+        assert asyncio.run(run()) == ['Async', 'Async']
+        assert mock_post.call_count == 2
+
+    @patch('ai_utils.llm_client.requests.Session.post')
+    def test_agenerate_batch(self, mock_post):
+        """Test async batch generation keeps prompt order and collects failures."""
+        import asyncio
+
+        import requests
+
+        def respond(url, data, **kwargs):
+            content = json.loads(data)['messages'][0]['content']
+            response = Mock()
+            if content == 'bad':
+                response.status_code = 400
+                response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=response)
+            else:
+                response.content = json.dumps({'choices': [{'message': {'content': content.upper()}}]}).encode()
+                response.raise_for_status = Mock()
+            return response
+
+        mock_post.side_effect = respond
+
+        client = LLMClient()
+        prompts = [f"prompt {i}" for i in range(10)]
+        results = asyncio.run(client.agenerate_batch(prompts, max_concurrency=3))
+        assert results == [p.upper() for p in prompts]
+
+        results = asyncio.run(client.agenerate_batch(["ok", "bad"], return_exceptions=True))
+        assert results[0] == 'OK'
+        assert isinstance(results[1], requests.exceptions.HTTPError)
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            asyncio.run(client.agenerate_batch(["bad"]))
+        with pytest.raises(ValueError, match="max_concurrency"):
+            asyncio.run(client.agenerate_batch(["ok"], max_concurrency=0))
+
+    @patch('ai_utils.llm_client.requests.Session.post')
+    def test_session_reused_across_calls(self, mock_post):
+        """Test requests share one pooled session per client."""
+        mock_response = Mock()
+        mock_response.content = json.dumps({'choices': [{'message': {'content': 'Test'}}]}).encode()
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+
+        client = LLMClient()
+        session = client._session
+        client.generate("one")
+        client.generate("two")
+
+        assert client._session is session
+        assert mock_post.call_count == 2
+        adapter = session.get_adapter('https://api.test.com/v1/chat/completions')
+        assert adapter._pool_maxsize >= 10
+
+    @patch('ai_utils.llm_client.requests.Session.post')
+    def test_stdlib_body_serializer(self, mock_post, monkeypatch):
+        """Test request bodies are valid JSON bytes without orjson."""
+        from ai_utils import llm_client
+
+        monkeypatch.setattr(llm_client, "_dumps_body", lambda p: json.dumps(p).encode("utf-8"))
+        mock_response = Mock()
+        mock_response.content = json.dumps({'choices': [{'message': {'content': 'Test'}}]}).encode()
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+
+        LLMClient().generate("Héllo", top_p=0.5)
+        body = mock_post.call_args.kwargs['data']
+        assert isinstance(body, bytes)
+        assert json.loads(body)['messages'][0]['content'] == "Héllo"
+
+    def test_context_manager_closes_session(self):
+        """Test the client closes its session on exit."""
+        with patch('ai_utils.llm_client.requests.Session.close') as mock_close:
+            with LLMClient() as client:
+                assert isinstance(client, LLMClient)
+            mock_close.assert_called_once()
+
+    @patch('ai_utils.llm_client.requests.Session.post')
+    def test_response_cache(self, mock_post, tmp_path):
+        """Test identical requests are served from the disk cache."""
+        mock_response = Mock()
+        mock_response.content = json.dumps({'choices': [{'message': {'content': 'Cached'}}]}).encode()
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+
+        client = LLMClient(cache_dir=tmp_path)
+        assert client.generate("Test", temperature=0) == 'Cached'
+        assert client.generate("Test", temperature=0) == 'Cached'
+        assert mock_post.call_count == 1
+
+        # A new client sharing the directory reuses the entry
+        assert LLMClient(cache_dir=tmp_path).generate("Test", temperature=0) == 'Cached'
+        assert mock_post.call_count == 1
+
+        # Any change to the request is a miss
+        client.generate("Test", temperature=1)
+        client.generate("Other", temperature=0)
+        LLMClient(cache_dir=tmp_path, model='other-model').generate("Test", temperature=0)
+        assert mock_post.call_count == 4
+        assert not list(tmp_path.rglob("*.tmp"))
+
+    @patch('ai_utils.llm_client.requests.Session.post')
+    def test_memory_cache(self, mock_post):
+        """Test the in-memory LRU answers repeats and evicts the oldest entry."""
+        mock_response = Mock()
+        mock_response.content = json.dumps({'choices': [{'message': {'content': 'Cached'}}]}).encode()
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+
+        client = LLMClient(cache_size=2)
+        client.generate("a", temperature=0)
+        client.generate("a", temperature=0)
+        assert mock_post.call_count == 1
+
+        client.generate("a", temperature=1)
+        client.generate("b", temperature=0)  # evicts ("a", temperature=0)
+        client.generate("a", temperature=0)
+        assert mock_post.call_count == 4
+
+        # Disabled by default
+        uncached = LLMClient()
+        uncached.generate("a")
+        uncached.generate("a")
+        assert mock_post.call_count == 6
+
+        with pytest.raises(ValueError, match="cache_size"):
+            LLMClient(cache_size=-1)
+
+    @patch('ai_utils.llm_client.requests.Session.post')
+    def test_corrupt_cache_entry_is_a_miss(self, mock_post, tmp_path):
+        """Test unreadable cache entries fall back to the API."""
+        mock_response = Mock()
+        mock_response.content = json.dumps({'choices': [{'message': {'content': 'Fresh'}}]}).encode()
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+
+        client = LLMClient(cache_dir=tmp_path)
+        client.generate("Test")
+        (entry,) = tmp_path.rglob("*.json")
+        entry.write_text("{not json", encoding="utf-8")
+
+        assert client.generate("Test") == 'Fresh'
+        assert mock_post.call_count == 2
+
+    @patch('ai_utils.llm_client.requests.Session.post')
+    def test_generate_stream(self, mock_post):
+        """Test streaming yields content deltas from server-sent events."""
+        mock_response = Mock()
+        mock_response.raise_for_status = Mock()
+        mock_response.iter_lines.return_value = iter([
+            b'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+            b'',
+            b'data: {"choices": [{"delta": {"content": "Hel"}}]}',
+            b': keep-alive',
+            b'data: {"choices": [{"delta": {"content": "lo"}}]}',
+            b'data: [DONE]',
+            b'data: {"choices": [{"delta": {"content": "ignored"}}]}',
+        ])
+        mock_post.return_value = mock_response
+
+        client = LLMClient()
+        assert list(client.generate_stream("Test", temperature=0)) == ["Hel", "lo"]
+
+        call_args = mock_post.call_args
+        assert call_args.kwargs['stream'] is True
+        payload = json.loads(call_args.kwargs['data'])
+        assert payload['stream'] is True
+        assert payload['temperature'] == 0
+        mock_response.close.assert_called_once()
+
+    @patch('ai_utils.llm_client.requests.Session.post')
+    @patch('ai_utils.llm_client.time.sleep')
+    def test_generate_stream_retries_connect(self, mock_sleep, mock_post):
+        """Test streaming retries failures before the response arrives."""
+        import requests
+
+        mock_response = Mock()
+        mock_response.raise_for_status = Mock()
+        mock_response.iter_lines.return_value = iter([b'data: {"choices": [{"delta": {"content": "ok"}}]}'])
+        mock_post.side_effect = [requests.exceptions.Timeout("Timeout"), mock_response]
+
+        client = LLMClient(max_retries=3)
+        assert list(client.generate_stream("Test")) == ["ok"]
+        assert mock_post.call_count == 2
+        assert mock_sleep.call_count == 1
+
+    def test_generate_stream_validation(self):
+        """Test streaming validates the prompt before sending."""
+        client = LLMClient()
+        with pytest.raises(ValueError, match="prompt cannot be empty"):
+            client.generate_stream("   ")
+
+    @patch('ai_utils.llm_client.requests.Session.post')
+    @patch('ai_utils.llm_client.time.sleep')
+    def test_retry_after_header(self, mock_sleep, mock_post):
+        """Test 429 responses wait for the server's Retry-After hint."""
+        import requests
+
+        mock_response_429 = Mock()
+        mock_response_429.status_code = 429
+        mock_response_429.headers = {'Retry-After': '7'}
+        mock_response_429.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            response=mock_response_429
+        )
+
+        mock_response_success = Mock()
+        mock_response_success.content = json.dumps({
+            'choices': [{'message': {'content': 'Success'}}]
+        }).encode()
+        mock_response_success.raise_for_status = Mock()
+        mock_post.side_effect = [mock_response_429, mock_response_success]
+
+        client = LLMClient(max_retries=3, initial_retry_delay=1.0)
+        assert client.generate("Test") == "Success"
+
+        delay = mock_sleep.call_args.args[0]
+        assert 7.0 <= delay <= 8.4
+
+    @patch('ai_utils.llm_client.requests.Session.post')
+    @patch('ai_utils.llm_client.time.sleep')
+    def test_retry_after_is_capped(self, mock_sleep, mock_post):
+        """Test a huge Retry-After hint is clamped to max_retry_after."""
+        import requests
+
+        mock_response_429 = Mock()
+        mock_response_429.status_code = 429
+        mock_response_429.headers = {'Retry-After': '86400'}
+        mock_response_429.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            response=mock_response_429
+        )
+        mock_post.return_value = mock_response_429
+
+        client = LLMClient(max_retries=2, max_retry_after=5.0)
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.generate("Test")
+        assert mock_sleep.call_args.args[0] == 5.0
+
+        with pytest.raises(ValueError, match="max_retry_after"):
+            LLMClient(max_retry_after=-1)
+
+    def test_retry_after_parsing(self):
+        """Test Retry-After values in seconds and HTTP-date form."""
+        from datetime import datetime, timedelta, timezone
+        from email.utils import format_datetime
+
+        from ai_utils.llm_client import _retry_after_seconds
+
+        def response(value):
+            mock_response = Mock()
+            mock_response.headers = {} if value is None else {'Retry-After': value}
+            return mock_response
+
+        assert _retry_after_seconds(response('3')) == 3.0
+        assert _retry_after_seconds(response(' 1.5 ')) == 1.5
+        assert _retry_after_seconds(response(None)) is None
+        assert _retry_after_seconds(response('soon')) is None
+        assert _retry_after_seconds(response('inf')) is None
+        assert _retry_after_seconds(None) is None
+
+        future = datetime.now(timezone.utc) + timedelta(seconds=30)
+        assert 20 < _retry_after_seconds(response(format_datetime(future, usegmt=True))) <= 30
+        past = datetime.now(timezone.utc) - timedelta(seconds=30)
+        assert _retry_after_seconds(response(format_datetime(past, usegmt=True))) == 0.0
+
+    @patch('ai_utils.llm_client.requests.Session.post')
+    @patch('ai_utils.llm_client.time.sleep')
+    def test_stats(self, mock_sleep, mock_post):
+        """Test per-client call and retry statistics."""
+        import requests
+
+        ok = Mock()
+        ok.content = json.dumps({'choices': [{'message': {'content': 'ok'}}]}).encode()
+        ok.raise_for_status = Mock()
+        mock_post.side_effect = [requests.exceptions.Timeout("Timeout"), ok, ok]
+
+        client = LLMClient(max_retries=3)
+        client.generate("one")
+        client.generate("two")
+
+        stats = client.stats()
+        assert stats['calls'] == 2
+        assert stats['retries'] == 1
+        assert stats['failures'] == 0
+        assert 0 < stats['ewma_retries'] < 1
+        assert stats['backoff_scale'] == 1.0
+
+        mock_post.side_effect = requests.exceptions.Timeout("Timeout")
+        with pytest.raises(requests.exceptions.Timeout):
+            client.generate("three")
+        assert client.stats()['failures'] == 1
+        assert client.stats()['retries'] == 3
+
+    @patch('ai_utils.llm_client.requests.Session.post')
+    @patch('ai_utils.llm_client.time.sleep')
+    def test_adaptive_backoff(self, mock_sleep, mock_post):
+        """Test adaptive backoff shortens waits when calls rarely retry."""
+        import requests
+
+        ok = Mock()
+        ok.content = json.dumps({'choices': [{'message': {'content': 'ok'}}]}).encode()
+        ok.raise_for_status = Mock()
+        mock_post.side_effect = [requests.exceptions.Timeout("Timeout"), ok]
+
+        client = LLMClient(max_retries=3, initial_retry_delay=1.0, adaptive_backoff=True)
+        client.generate("Test")
+
+        # No history yet: the scale starts at its 0.25 floor
+        assert mock_sleep.call_args.args[0] == 0.25
+        assert client.stats()['backoff_scale'] == 0.25
+
+        mock_post.side_effect = requests.exceptions.Timeout("Timeout")
+        for _ in range(10):
+            with pytest.raises(requests.exceptions.Timeout):
+                client.generate("Test")
+        assert client.stats()['backoff_scale'] > 1.0
+
+
+class TestLazyImport:
+    """Tests for deferring the LLMClient import."""
+
+    def test_import_does_not_load_llm_client(self):
+        """Test importing ai_utils leaves requests and llm_client unloaded."""
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, ai_utils\n"
+            "assert 'ai_utils.llm_client' not in sys.modules\n"
+            "assert ai_utils.LLMClient.__name__ == 'LLMClient'\n"
+            "assert 'ai_utils.llm_client' in sys.modules\n"
+        )
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+        subprocess.run([sys.executable, "-c", code], check=True, env=env)
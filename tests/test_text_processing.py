@@ -1,14 +1,19 @@
 """Tests for text processing utilities."""
 
 import pytest
+import ai_utils
 from ai_utils import (
     clean_text,
     estimate_token_count,
+    estimate_token_counts_batch,
     safe_truncate_tokens,
     merge_context_snippets,
     split_into_chunks,
+    iter_chunks,
     summarise_text,
     estimate_llm_cost,
+    estimate_llm_cost_batch,
+    get_model_pricing,
 )
 
 
@@ -59,6 +64,18 @@ class TestCleanText:
         with pytest.raises(TypeError):
             clean_text(None)  # type: ignore
 
+    def test_cache_controls_and_size_bound(self):
+        clean_text.cache_clear()
+        assert clean_text("  a   b ") == "a b"
+        assert clean_text("  a   b ") == "a b"
+        assert clean_text.cache_info().hits == 1
+
+        long_text = "word  " * 1000
+        assert clean_text(long_text) == " ".join(["word"] * 1000)
+        assert clean_text.cache_info().currsize == 1
+        clean_text.cache_clear()
+        assert clean_text.cache_info().currsize == 0
+
 
 class TestEstimateTokenCount:
     """Tests for estimate_token_count function."""
@@ -100,6 +117,62 @@ class TestEstimateTokenCount:
         with pytest.raises(ValueError):
             estimate_token_count("text", model="   ")
 
+    def test_repeated_calls_are_stable(self):
+        text = "Repeated prompt text for caching."
+        first = estimate_token_count(text, model=DEFAULT_MODEL)
+        assert estimate_token_count(text, model=DEFAULT_MODEL) == first
+        assert estimate_token_count(text, model=" GPT-3.5-turbo ") == first
+
+    def test_long_texts_bypass_cache(self):
+        cache = ai_utils._estimate_token_count_cached
+        cache.cache_clear()
+        long_text = "document " * 1000
+        assert estimate_token_count(long_text, model=DEFAULT_MODEL) == 2250
+        assert estimate_llm_cost(long_text, model=DEFAULT_MODEL) > 0
+        assert cache.cache_info().currsize == 0
+        estimate_token_count("short prompt", model=DEFAULT_MODEL)
+        assert cache.cache_info().currsize == 1
+
+    def test_exact_tokens_with_tiktoken(self, monkeypatch):
+        tiktoken = pytest.importorskip("tiktoken")
+        monkeypatch.setattr(ai_utils, "_EXACT_TOKENS_ENABLED", True)
+        caches = (ai_utils._exact_encoding_for_model, ai_utils._estimate_token_count_cached)
+        for cache in caches:
+            cache.cache_clear()
+        try:
+            text = "Exact token counts come from tiktoken."
+            expected = len(tiktoken.encoding_for_model("gpt-4o").encode(text))
+            assert estimate_token_count(text, model="gpt-4o") == expected
+            chunks = split_into_chunks(" ".join(["token"] * 200), max_tokens=16, model="gpt-4o")
+            assert all(estimate_token_count(chunk, model="gpt-4o") <= 16 for chunk in chunks)
+        finally:
+            for cache in caches:
+                cache.cache_clear()
+
+
+class TestEstimateTokenCountsBatch:
+    """Tests for estimate_token_counts_batch function."""
+
+    def test_matches_scalar_estimates(self):
+        texts = ["Hello world", "", "Another prompt with more words", "Hello world"]
+        expected = [estimate_token_count(text, model=DEFAULT_MODEL) for text in texts]
+        assert estimate_token_counts_batch(texts, model=DEFAULT_MODEL) == expected
+
+    def test_empty_batch(self):
+        assert estimate_token_counts_batch([], model=DEFAULT_MODEL) == []
+
+    def test_type_error_not_list(self):
+        with pytest.raises(TypeError):
+            estimate_token_counts_batch("not a list", model=DEFAULT_MODEL)  # type: ignore
+
+    def test_type_error_item(self):
+        with pytest.raises(TypeError):
+            estimate_token_counts_batch(["ok", 123], model=DEFAULT_MODEL)  # type: ignore
+
+    def test_invalid_model_name(self):
+        with pytest.raises(ValueError):
+            estimate_token_counts_batch(["text"], model="   ")
+
 
 class TestSafeTruncateTokens:
     """Tests for safe_truncate_tokens function."""
@@ -109,6 +182,22 @@ class TestSafeTruncateTokens:
         result = safe_truncate_tokens(text, max_tokens=4, model=DEFAULT_MODEL)
         assert result == "This is a test"
 
+    def test_word_truncation_preserves_spacing(self):
+        text = "a  b\tc d e f g h"
+        result = safe_truncate_tokens(text, max_tokens=3, model=DEFAULT_MODEL)
+        assert result == "a  b\tc"
+
+    def test_wide_spacing_stays_within_budget(self):
+        text = "alpha" + " " * 40 + "beta gamma delta"
+        result = safe_truncate_tokens(text, max_tokens=2, model=DEFAULT_MODEL)
+        assert result
+        assert estimate_token_count(result, model=DEFAULT_MODEL) <= 2
+
+    def test_joined_sentences_stay_within_budget(self):
+        text = "x Delta! a\tDelta! alpha beta gamma"
+        result = safe_truncate_tokens(text, max_tokens=4, model=DEFAULT_MODEL)
+        assert estimate_token_count(result, model=DEFAULT_MODEL) <= 4
+
     def test_sentence_boundary_preference(self):
         text = "First sentence. Second sentence is longer."
         result = safe_truncate_tokens(text, max_tokens=3, model=DEFAULT_MODEL)
@@ -250,6 +339,14 @@ class TestSplitIntoChunks:
         assert len(chunks) > 1
         assert all(estimate_token_count(chunk, model=DEFAULT_MODEL) <= 20 for chunk in chunks)
 
+    def test_long_segment_mixed_word_lengths(self):
+        # Long words make the character-based estimate dominate mid-segment
+        words = ["a", "internationalization", "of", "counterrevolutionaries", "x"] * 40
+        chunks = split_into_chunks(" ".join(words), max_tokens=12)
+        assert len(chunks) > 1
+        assert " ".join(chunks).split() == words
+        assert all(estimate_token_count(chunk, model=DEFAULT_MODEL) <= 12 for chunk in chunks)
+
     def test_mixed_paragraph_lengths(self):
         text = "Short.\n\n" + " ".join([f"word{i}" for i in range(50)]) + "\n\nAnother short."
         chunks = split_into_chunks(text, max_tokens=20)
@@ -300,6 +397,29 @@ class TestSplitIntoChunks:
         assert all(isinstance(chunk, str) and chunk for chunk in chunks)
 
 
+class TestIterChunks:
+    """Tests for iter_chunks function."""
+
+    def test_matches_split_into_chunks(self):
+        text = " ".join(f"Sentence number {i} has a few words." for i in range(40))
+        expected = split_into_chunks(text, max_tokens=20, overlap_tokens=5)
+        assert list(iter_chunks(text, max_tokens=20, overlap_tokens=5)) == expected
+
+    def test_is_lazy(self):
+        text = " ".join(f"Sentence number {i}." for i in range(1000))
+        chunks = iter_chunks(text, max_tokens=10)
+        assert next(chunks) == split_into_chunks(text, max_tokens=10)[0]
+
+    def test_empty_string(self):
+        assert list(iter_chunks("", max_tokens=10)) == []
+
+    def test_validates_eagerly(self):
+        with pytest.raises(ValueError):
+            iter_chunks("text", max_tokens=0)
+        with pytest.raises(TypeError):
+            iter_chunks(123, max_tokens=10)  # type: ignore
+
+
 class TestSummariseText:
     """Tests for summarise_text function."""
 
@@ -360,6 +480,16 @@ class TestSummariseText:
         with pytest.raises(ValueError):
             summarise_text("text", max_chars=-10)
 
+    def test_long_texts_bypass_cache(self):
+        ai_utils._summarise_text_cached.cache_clear()
+        short = "First sentence. Middle content. Last sentence."
+        long_text = "Opening line. " + "Filler sentence here. " * 500 + "Closing line."
+        assert len(long_text) > ai_utils._TEXT_CACHE_MAX_CHARS
+
+        assert summarise_text(short, max_chars=40) == summarise_text(short, max_chars=40)
+        assert summarise_text(long_text, max_chars=40) == "Opening line. ... Closing line."
+        assert ai_utils._summarise_text_cached.cache_info().currsize == 1
+
 
 class TestEdgeCases:
     """Test edge cases and multilingual support."""
@@ -443,3 +573,83 @@ class TestEstimateLlmCost:
     def test_invalid_response_tokens(self):
         with pytest.raises(ValueError):
             estimate_llm_cost("text", model="gpt-3.5-turbo", expected_response_tokens=-5)
+
+
+class TestEstimateLlmCostBatch:
+    """Tests for estimate_llm_cost_batch helper."""
+
+    def test_matches_scalar_costs(self):
+        texts = ["Hello world", "", "A longer prompt with several more words in it."]
+        expected = [estimate_llm_cost(text, model="gpt-4o") for text in texts]
+        assert estimate_llm_cost_batch(texts, model="gpt-4o") == expected
+
+    def test_expected_response_tokens_and_overrides(self):
+        override = {"custom": {"input": 0.002, "output": 0.004}}
+        texts = ["Prompt one", "Prompt two is longer"]
+        expected = [
+            estimate_llm_cost(text, model="custom-model", expected_response_tokens=50, pricing_overrides=override)
+            for text in texts
+        ]
+        result = estimate_llm_cost_batch(
+            texts, model="custom-model", expected_response_tokens=50, pricing_overrides=override
+        )
+        assert result == expected
+
+    def test_empty_batch(self):
+        assert estimate_llm_cost_batch([], model="gpt-4o") == []
+
+    def test_type_error_item(self):
+        with pytest.raises(TypeError):
+            estimate_llm_cost_batch(["ok", 123], model="gpt-4o")  # type: ignore
+
+    def test_invalid_expected_tokens(self):
+        with pytest.raises(ValueError):
+            estimate_llm_cost_batch(["ok"], model="gpt-4o", expected_response_tokens=-1)
+
+
+class TestGetModelPricing:
+    """Tests for get_model_pricing helper."""
+
+    def test_known_model(self):
+        assert get_model_pricing("gpt-4o") == (0.005, 0.015)
+
+    def test_matches_estimate_llm_cost(self):
+        input_price, output_price = get_model_pricing("gpt-3.5-turbo")
+        tokens = estimate_token_count("Hello world", model="gpt-3.5-turbo")
+        expected = round(tokens / 1000 * input_price + 100 / 1000 * output_price, 8)
+        cost = estimate_llm_cost("Hello world", model="gpt-3.5-turbo", expected_response_tokens=100)
+        assert cost == expected
+
+    def test_override_defaults_output_to_input(self):
+        override = {"custom": {"input": 0.002}}
+        assert get_model_pricing("custom-model", pricing_overrides=override) == (0.002, 0.002)
+
+    def test_longest_prefix_wins(self):
+        assert get_model_pricing("gpt-4o-mini") == (0.0006, 0.0024)
+        assert get_model_pricing("gpt-4o") == (0.005, 0.015)
+
+    def test_unknown_model(self):
+        with pytest.raises(ValueError):
+            get_model_pricing("unknown-model")
+
+    def test_type_error_model(self):
+        with pytest.raises(TypeError):
+            get_model_pricing(123)  # type: ignore
+
+    def test_pricing_config_loaded_lazily(self, tmp_path, monkeypatch):
+        config = tmp_path / "pricing.json"
+        config.write_text('{"models": {"local-llm": {"input": 0.5, "output": 1.0}}}', encoding="utf-8")
+        monkeypatch.setenv("AI_UTILS_PRICING_CONFIG", str(config))
+        caches = (
+            ai_utils._base_pricing,
+            ai_utils._base_pricing_items,
+            ai_utils._cached_model_pricing,
+            ai_utils._cached_per_token_prices,
+        )
+        for cache in caches:
+            cache.cache_clear()
+        try:
+            assert get_model_pricing("local-llm-7b") == (0.5, 1.0)
+        finally:
+            for cache in caches:
+                cache.cache_clear()